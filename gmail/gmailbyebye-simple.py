@@ -4,26 +4,57 @@ Gmail Email Cleanup via IMAP (App Password)
 Simple version - no OAuth, no Google Cloud project needed.
 Just enable 2FA, generate an App Password, and go.
 """
+import hashlib
 import imaplib
 import os
+import re
+import sqlite3
 import ssl
 import stat
 import sys
 import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from collections import defaultdict
-from email import message_from_bytes
-from email.utils import parsedate_to_datetime
-from fnmatch import fnmatch
+from collections import OrderedDict, defaultdict, deque
+from email.utils import parseaddr, parsedate_to_datetime
+from fnmatch import translate
 
 # Config
 IMAP_SERVER = "imap.gmail.com"
 IMAP_PORT = 993
+TRASH_FOLDER = "[Gmail]/Trash"  # Replaced by the account's \Trash folder once LIST has run
+KEEPALIVE_INTERVAL = 300  # Seconds idle before sending NOOP (Gmail drops idle sockets)
+PIPELINE_WINDOW = 3  # Backup FETCHes kept in flight at once - small to stay polite to the server
+FETCH_TARGET_BYTES = 32 * 1024 * 1024  # Aim for ~32MB per backup FETCH response
+MIN_FETCH_BATCH = 16  # ...but never shrink below this many messages
+MAX_FOLDER_WORKERS = 8  # Parallel folder sessions (Gmail allows 15 IMAP connections per account)
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 CONFIG_FILE_LOCAL = os.path.join(SCRIPT_DIR, ".gmail_simple_config")
+HEADER_CACHE_DIR = os.path.expanduser("~/.gmail_simple_cache")
+VERBOSE = False  # --verbose: per-batch detail instead of a single progress line
 CONFIG_FILE_HOME = os.path.expanduser("~/.gmail_simple_config")
 
+# Matches the UID in a FETCH response envelope, e.g. b'3 (UID 1234 BODY[...] {512}'
+FETCH_UID_RE = re.compile(rb'UID (\d+)')
+# Folded header continuation: CRLF followed by whitespace (RFC 5322 2.2.3)
+HEADER_FOLD_RE = re.compile(rb'\r?\n[ \t]+')
+# One LIST response line, e.g. b'(\\HasNoChildren \\Trash) "/" "[Gmail]/Trash"'
+LIST_LINE_RE = re.compile(rb'\((?P<flags>[^)]*)\) (?:"[^"]*"|NIL) (?P<name>.+)$')
+# COPYUID response code (RFC 4315), e.g. b'[COPYUID 38505 304,319:320 3956:3958] Done'
+COPYUID_RE = re.compile(rb'\[COPYUID (\S+ \S+ \S+)\]')
+
+# SPECIAL-USE flags (RFC 6154) Gmail puts on its system folders, by LABELS name
+SPECIAL_USE_LABELS = {
+    b"\\SENT": "SENT",
+    b"\\JUNK": "SPAM",
+    b"\\TRASH": "TRASH",
+    b"\\DRAFTS": "DRAFTS",
+    b"\\ALL": "ALL",
+    b"\\FLAGGED": "STARRED",
+    b"\\IMPORTANT": "IMPORTANT",
+}
+
 # Defaults
 DEFAULT_CONFIG = {
     "YEARS_OLD": 1,
@@ -33,6 +64,74 @@ DEFAULT_CONFIG = {
     "BATCH_SIZE": 100,
     "EXCLUDE_SUBJECTS": None,
     "EXCLUDE_SENDERS": None,
+    "ZIP_COMPRESS_LEVEL": 1,  # 1-9 = deflate level for backups, 0 = store as-is
+}
+
+
+_progress_shown = False  # A \r progress line is on screen and needs ending
+
+
+def log(msg, level="info"):
+    """Print a message; "debug" messages only show with --verbose."""
+    global _progress_shown
+    if level == "debug" and not VERBOSE:
+        return
+    if _progress_shown:
+        print()
+        _progress_shown = False
+    print(msg)
+
+
+def progress(msg):
+    """
+    Show a progress line. On a terminal it is rewritten in place, so long
+    runs don't scroll thousands of lines; otherwise it's printed normally.
+    """
+    global _progress_shown
+    if VERBOSE or not sys.stdout.isatty():
+        log(msg)
+        return
+    print(f"\r{msg}\033[K", end="", flush=True)
+    _progress_shown = True
+
+
+def string_setting(name):
+    """Config handler storing the value as-is under name."""
+    def apply(config, value):
+        config[name] = value
+    return apply
+
+
+def int_setting(name, is_valid, warning):
+    """Config handler storing an int under name, or printing warning if invalid."""
+    def apply(config, value):
+        val = int(value)
+        if is_valid(val):
+            config[name] = val
+        else:
+            print(warning)
+    return apply
+
+
+def ignore_setting(config, value):
+    """Config handler for unknown keys."""
+
+
+# Config file key -> handler(config, value)
+CONFIG_HANDLERS = {
+    "GMAIL_EMAIL": string_setting("email"),
+    "GMAIL_APP_PASSWORD": lambda config, value: config.update(password=value.replace(" ", "")),
+    "CUTOFF_DATE": string_setting("CUTOFF_DATE"),
+    "YEARS_OLD": int_setting("YEARS_OLD", lambda val: val >= 0,
+                             "Warning: YEARS_OLD cannot be negative, using default (1)"),
+    "BATCH_SIZE": int_setting("BATCH_SIZE", lambda val: val > 0,
+                              "Warning: BATCH_SIZE must be positive, using default (100)"),
+    "DELETE_YEARS": string_setting("DELETE_YEARS"),
+    "LABELS": string_setting("LABELS"),
+    "EXCLUDE_SUBJECTS": string_setting("EXCLUDE_SUBJECTS"),
+    "EXCLUDE_SENDERS": string_setting("EXCLUDE_SENDERS"),
+    "ZIP_COMPRESS_LEVEL": int_setting("ZIP_COMPRESS_LEVEL", lambda val: 0 <= val <= 9,
+                                      "Warning: ZIP_COMPRESS_LEVEL must be 0-9, using default (1)"),
 }
 
 
@@ -59,32 +158,7 @@ def load_config():
                     key = key.strip()
                     value = value.strip()
 
-                    if key == "GMAIL_EMAIL":
-                        config["email"] = value
-                    elif key == "GMAIL_APP_PASSWORD":
-                        config["password"] = value.replace(" ", "")
-                    elif key == "CUTOFF_DATE":
-                        config["CUTOFF_DATE"] = value
-                    elif key == "YEARS_OLD":
-                        val = int(value)
-                        if val < 0:
-                            print(f"Warning: YEARS_OLD cannot be negative, using default (1)")
-                        else:
-                            config["YEARS_OLD"] = val
-                    elif key == "BATCH_SIZE":
-                        val = int(value)
-                        if val <= 0:
-                            print(f"Warning: BATCH_SIZE must be positive, using default (100)")
-                        else:
-                            config["BATCH_SIZE"] = val
-                    elif key == "DELETE_YEARS":
-                        config["DELETE_YEARS"] = value
-                    elif key == "LABELS":
-                        config["LABELS"] = value
-                    elif key == "EXCLUDE_SUBJECTS":
-                        config["EXCLUDE_SUBJECTS"] = value
-                    elif key == "EXCLUDE_SENDERS":
-                        config["EXCLUDE_SENDERS"] = value
+                    CONFIG_HANDLERS.get(key, ignore_setting)(config, value)
 
         print(f"Loaded config from {config_file}")
 
@@ -109,6 +183,219 @@ def connect_imap(config):
     return imap
 
 
+class ImapSession:
+    """
+    Long-lived IMAP connection that reconnects on its own.
+
+    Remembers the selected folder so a dropped connection comes back in the
+    same place, and sends NOOP when idle so Gmail doesn't close the socket
+    during long backups or while waiting at a prompt.
+
+    Also supports pipelined UID FETCH: send_uid_fetch() queues a command
+    without waiting, read_uid_fetch() collects its response later. Any other
+    command first waits out the queued FETCHes so their untagged responses
+    never get mixed up with its own.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.imap = None
+        self.folder = None
+        self.readonly = False
+        self.uidvalidity = None
+        self.last_activity = 0.0
+        self.in_flight = OrderedDict()  # {ticket: (tag, uid_set, spec)}
+        self.ready = {}  # {ticket: (status, data)}
+        self.next_ticket = 0
+        self.capabilities = set()
+
+    def connect(self):
+        """Log in (TLS + LOGIN) and re-select the last folder, if any."""
+        self.imap = connect_imap(self.config)
+        self.last_activity = time.monotonic()
+        # Gmail only advertises some extensions (UIDPLUS, MOVE...) once logged in
+        status, data = self.imap.capability()
+        if status == 'OK' and data and data[-1]:
+            self.capabilities = set(data[-1].decode().upper().split())
+        if self.folder:
+            self.imap.select(f'"{self.folder}"', self.readonly)
+            self._read_uidvalidity()
+
+    def _read_uidvalidity(self):
+        """Remember the selected folder's UIDVALIDITY (from the SELECT response)."""
+        _, data = self.imap.response('UIDVALIDITY')
+        self.uidvalidity = data[-1].decode() if data and data[-1] else None
+
+    def reconnect(self):
+        """Drop the current connection and log in again."""
+        self.logout()
+        self.connect()
+
+    def _call(self, method, *args):
+        """Run an imaplib command, reconnecting once if the socket died."""
+        if self.imap is None:
+            self.connect()
+        self.complete_fetches()
+        try:
+            result = getattr(self.imap, method)(*args)
+        except (imaplib.IMAP4.abort, OSError):
+            self.reconnect()
+            result = getattr(self.imap, method)(*args)
+        self.last_activity = time.monotonic()
+        return result
+
+    def select(self, folder, readonly=False):
+        """
+        SELECT a folder (EXAMINE if readonly), skipping the round-trip when
+        it is already selected in a mode that allows what the caller needs.
+        """
+        if self.imap is not None and folder == self.folder and (readonly or not self.readonly):
+            return 'OK', [None]
+        status, data = self._call('select', f'"{folder}"', readonly)
+        self.folder = folder if status == 'OK' else None
+        self.readonly = readonly
+        self.uidvalidity = None
+        if self.folder:
+            self._read_uidvalidity()
+        return status, data
+
+    def uid(self, command, *args):
+        return self._call('uid', command, *args)
+
+    def expunge(self):
+        return self._call('expunge')
+
+    def expunge_uids(self, uid_set):
+        """
+        Expunge just these UIDs with UID EXPUNGE (UIDPLUS, RFC 4315), so other
+        \\Deleted messages in the folder are left alone and the server only
+        walks this batch. Falls back to a plain EXPUNGE without UIDPLUS.
+        """
+        if 'UIDPLUS' not in self.capabilities:
+            return self.expunge()
+        result = self.uid('EXPUNGE', uid_set)
+        # imaplib only clears these for its own expunge(); don't let them pile up
+        self.imap.untagged_responses.pop('EXPUNGE', None)
+        return result
+
+    def move_uids(self, uid_set, folder):
+        """
+        Move messages to another folder: UID MOVE (RFC 6851) if the server
+        has it, otherwise COPY and then expunge them here.
+
+        Returns:
+            UID set of the messages in the destination folder, if the server
+            reported one (COPYUID), else None
+        """
+        target = f'"{folder}"'
+        # Run through _simple_command rather than uid(), which only hands back
+        # untagged data - COPY reports COPYUID in its tagged reply
+        self.imap.untagged_responses.pop('COPYUID', None)  # Not a stale one
+        command = 'MOVE' if 'MOVE' in self.capabilities else 'COPY'
+        status, data = self._call('_simple_command', 'UID', command, uid_set, target)
+        if status != 'OK':
+            raise imaplib.IMAP4.error(f"Failed to move messages to {folder}")
+
+        # COPYUID <uidvalidity> <source uids> <destination uids> - tagged for
+        # COPY, in an untagged OK for MOVE
+        match = COPYUID_RE.search(data[-1] or b'') if data else None
+        _, untagged = self.imap.response('COPYUID')
+        copyuid = match.group(1) if match else (untagged[-1] if untagged else None)
+        self.imap.untagged_responses.pop('EXPUNGE', None)
+
+        if 'MOVE' not in self.capabilities:
+            status, _ = self.uid('STORE', uid_set, '+FLAGS', '(\\Deleted)')
+            if status != 'OK':
+                raise imaplib.IMAP4.error("Failed to flag copied messages for deletion")
+            self.expunge_uids(uid_set)
+
+        if copyuid:
+            parts = copyuid.split()
+            if len(parts) == 3:
+                return parts[2].decode()
+        return None
+
+    def send_uid_fetch(self, uid_set, spec):
+        """
+        Send a UID FETCH without waiting for its response.
+
+        Returns:
+            Ticket to pass to read_uid_fetch()
+        """
+        if self.imap is None:
+            self.connect()
+        ticket = self.next_ticket
+        self.next_ticket += 1
+        try:
+            tag = self.imap._command('UID', 'FETCH', uid_set, spec)
+        except (imaplib.IMAP4.abort, OSError):
+            self._recover_fetches()
+            self.ready[ticket] = self.imap.uid('FETCH', uid_set, spec)
+            return ticket
+        self.in_flight[ticket] = (tag, uid_set, spec)
+        return ticket
+
+    def read_uid_fetch(self, ticket):
+        """Wait for a pipelined FETCH and return its (status, data)."""
+        if ticket in self.in_flight:
+            self.complete_fetches(until=ticket)
+        return self.ready.pop(ticket)
+
+    def complete_fetches(self, until=None):
+        """Read responses for queued FETCHes, oldest first, up to `until`."""
+        try:
+            while self.in_flight:
+                ticket, (tag, _, _) = next(iter(self.in_flight.items()))
+                try:
+                    typ, dat = self.imap._command_complete('UID', tag)
+                except (imaplib.IMAP4.abort, OSError):
+                    raise
+                except imaplib.IMAP4.error:
+                    # BAD response - the command is finished, just failed
+                    del self.in_flight[ticket]
+                    raise
+                del self.in_flight[ticket]
+                self.ready[ticket] = self.imap._untagged_response(typ, dat, 'FETCH')
+                if ticket == until:
+                    break
+        except (imaplib.IMAP4.abort, OSError):
+            self._recover_fetches()
+        self.last_activity = time.monotonic()
+
+    def _recover_fetches(self):
+        """Reconnect after a drop and re-run the lost FETCHes synchronously."""
+        lost = list(self.in_flight.items())
+        self.in_flight.clear()
+        self.reconnect()
+        for ticket, (_, uid_set, spec) in lost:
+            self.ready[ticket] = self.imap.uid('FETCH', uid_set, spec)
+
+    def discard_fetches(self):
+        """Wait out any queued FETCHes and drop their results."""
+        try:
+            self.complete_fetches()
+        except (imaplib.IMAP4.error, OSError):
+            self.in_flight.clear()
+        self.ready.clear()
+
+    def list(self):
+        return self._call('list')
+
+    def keepalive(self):
+        """Send NOOP if the connection has been idle long enough to be dropped."""
+        if time.monotonic() - self.last_activity >= KEEPALIVE_INTERVAL:
+            self._call('noop')
+
+    def logout(self):
+        if self.imap is None:
+            return
+        try:
+            self.imap.logout()
+        except (imaplib.IMAP4.error, OSError):
+            pass
+        self.imap = None
+
+
 def build_imap_search(config):
     """
     Build IMAP SEARCH criteria from config.
@@ -144,19 +431,68 @@ def build_imap_search(config):
         criteria.append(f'BEFORE {before_str}')
         description = f"before {cutoff_date.strftime('%Y-%m-%d')}"
 
+    # Let the server drop excluded mail from the results where it can
+    server_subjects, server_senders = server_exclusions(config)
+    for keyword in server_subjects:
+        criteria.append(f'NOT SUBJECT "{keyword}"')
+    for sender in server_senders:
+        criteria.append(f'NOT FROM "{sender}"')
+    if server_subjects or server_senders:
+        description += f" (excluding {len(server_subjects) + len(server_senders)} patterns)"
+
     return " ".join(criteria), description
 
 
-def get_mailbox_folders(config):
+def find_special_folders(imap):
+    """
+    Find the real names of Gmail's system folders from one LIST command.
+
+    They're "[Gmail]/..." on most accounts but "[Google Mail]/..." on some,
+    and localized for non-English ones, so read their SPECIAL-USE flags
+    instead of guessing.
+
+    Returns:
+        {label: folder_name}, e.g. {"TRASH": "[Google Mail]/Bin"} - empty if LIST failed
+    """
+    try:
+        status, data = imap.list()
+    except imaplib.IMAP4.error:
+        return {}
+    if status != 'OK':
+        return {}
+
+    special = {}
+    for line in data or []:
+        if isinstance(line, tuple):  # Name sent as a literal
+            line = line[0].rsplit(b'{', 1)[0] + b'"' + line[1] + b'"'
+        match = LIST_LINE_RE.match(line or b'')
+        if not match:
+            continue
+        name = match.group('name').decode('utf-8', errors='replace')
+        if name.startswith('"') and name.endswith('"'):
+            name = name[1:-1].replace('\\"', '"').replace('\\\\', '\\')
+        for flag in match.group('flags').upper().split():
+            if flag in SPECIAL_USE_LABELS:
+                special[SPECIAL_USE_LABELS[flag]] = name
+
+    return special
+
+
+def get_mailbox_folders(config, special_folders=None):
     """
     Get list of IMAP folders to process from config.
     Maps common Gmail label names to IMAP folder names.
+
+    Args:
+        config: Configuration dict
+        special_folders: {label: folder_name} from find_special_folders(),
+                         overriding the default "[Gmail]/..." names
     """
     label_map = {
         "INBOX": "INBOX",
         "SENT": "[Gmail]/Sent Mail",
         "SPAM": "[Gmail]/Spam",
-        "TRASH": "[Gmail]/Trash",
+        "TRASH": TRASH_FOLDER,
         "DRAFTS": "[Gmail]/Drafts",
         "ALL": "[Gmail]/All Mail",
         "STARRED": "[Gmail]/Starred",
@@ -166,6 +502,7 @@ def get_mailbox_folders(config):
         "CATEGORY_UPDATES": "[Gmail]/Updates",
         "CATEGORY_FORUMS": "[Gmail]/Forums",
     }
+    label_map.update(special_folders or {})
 
     labels = config.get("LABELS")
     if not labels:
@@ -197,28 +534,129 @@ def parse_exclusions(config):
     return subject_keywords, sender_patterns
 
 
-def should_exclude(subject, sender, subject_keywords, sender_patterns):
-    """Check if a message should be excluded from deletion."""
+def is_search_literal(value):
+    """True if value can go into an IMAP SEARCH quoted string as-is."""
+    return bool(value) and value.isascii() and '"' not in value and '\\' not in value
+
+
+def server_exclusions(config):
+    """
+    Pick the exclusions IMAP SEARCH can use to narrow the search on the server.
+
+    These only shrink the result set - they never replace the per-message
+    check. Gmail's SEARCH SUBJECT/FROM match whole words, not substrings,
+    so NOT SUBJECT "invoice" still returns "Invoices" and "ProInvoice";
+    should_exclude() has to see every keyword and pattern before a message
+    is deleted. Sender patterns qualify when their only wildcard is a
+    leading '*' (*@irs.gov -> FROM "@irs.gov").
+
+    Returns:
+        (server_subjects, server_senders)
+    """
+    subject_keywords, sender_patterns = parse_exclusions(config)
+    server_subjects = [keyword for keyword in subject_keywords or [] if is_search_literal(keyword)]
+    server_senders = []
+    for pattern in sender_patterns or []:
+        literal = pattern.lstrip("*")
+        if is_search_literal(literal) and not any(c in literal for c in "*?["):
+            server_senders.append(literal)
+
+    return server_subjects, server_senders
+
+
+def keyword_trie_pattern(keywords):
+    """
+    Build a regex matching any keyword, with shared prefixes factored out.
+
+    ['news', 'newsletter', 'nasa'] -> 'n(?:asa|ews(?:letter)?)'
+
+    A flat 'a|b|c' alternation retries every keyword at each position in
+    the subject; the trie form rules most of them out on the first
+    character, so matching cost barely grows with the number of keywords.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}  # End of a keyword
+
+    def build(node):
+        ends_here = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not ends_here:
+            return branches[0]
+        group = f"(?:{'|'.join(branches)})"
+        return group + "?" if ends_here else group
+
+    return build(trie)
+
+
+def compile_exclusions(subject_keywords, sender_patterns):
+    """
+    Compile exclusion lists into one regex each, so every message is matched
+    in a single pass instead of looping over the patterns.
+
+    Returns:
+        (subject_re, sender_re) - either may be None
+    """
+    subject_re = None
+    sender_re = None
+
     if subject_keywords:
-        subject_lower = subject.lower()
-        for keyword in subject_keywords:
-            if keyword in subject_lower:
-                return True
+        subject_re = re.compile(keyword_trie_pattern(subject_keywords))
 
     if sender_patterns:
-        sender_lower = sender.lower()
-        if "<" in sender_lower and ">" in sender_lower:
-            sender_email = sender_lower.split("<")[1].split(">")[0]
-        else:
-            sender_email = sender_lower.strip()
+        sender_re = re.compile("|".join(f"(?:{translate(pattern)})" for pattern in sender_patterns))
 
-        for pattern in sender_patterns:
-            if fnmatch(sender_email, pattern):
-                return True
+    return subject_re, sender_re
+
+
+def should_exclude(subject, sender, subject_re, sender_re):
+    """Check if a message should be excluded from deletion."""
+    if subject_re and subject_re.search(subject.lower()):
+        return True
+
+    if sender_re:
+        # parseaddr copes with quoted display names like "Doe, Jane" <j@x.com>
+        sender_email = parseaddr(sender)[1] or sender
+        if sender_re.match(sender_email.strip().lower()):
+            return True
 
     return False
 
 
+def parse_header_fields(header_data):
+    """Parse Subject, From and Date out of a raw header block."""
+    if isinstance(header_data, str):
+        header_data = header_data.encode('utf-8', errors='replace')
+    # Unfold long headers first so continuation lines stay part of their value.
+    # Field names are ASCII, so match on bytes and only decode the values we keep.
+    header_data = HEADER_FOLD_RE.sub(b' ', header_data)
+
+    subject = ""
+    sender = ""
+    msg_date = None
+
+    for line in header_data.split(b'\r\n'):
+        if line[:8].lower() == b'subject:':
+            subject = line[8:].strip().decode('utf-8', errors='replace')
+        elif line[:5].lower() == b'from:':
+            sender = line[5:].strip().decode('utf-8', errors='replace')
+        elif line[:5].lower() == b'date:':
+            date_str = line[5:].strip().decode('ascii', errors='replace')
+            try:
+                msg_date = parsedate_to_datetime(date_str)
+                if msg_date.tzinfo:
+                    msg_date = msg_date.replace(tzinfo=None)
+            except Exception:
+                pass
+
+    return subject, sender, msg_date
+
+
 def get_message_headers(imap, uid):
     """Fetch Subject and From headers for a message UID."""
     try:
@@ -227,43 +665,211 @@ def get_message_headers(imap, uid):
             return "", "", None
 
         header_data = data[0][1] if isinstance(data[0], tuple) else data[0]
-        if isinstance(header_data, bytes):
-            header_data = header_data.decode('utf-8', errors='replace')
-
-        subject = ""
-        sender = ""
-        msg_date = None
-
-        for line in header_data.split('\r\n'):
-            lower = line.lower()
-            if lower.startswith('subject:'):
-                subject = line[8:].strip()
-            elif lower.startswith('from:'):
-                sender = line[5:].strip()
-            elif lower.startswith('date:'):
-                date_str = line[5:].strip()
-                try:
-                    msg_date = parsedate_to_datetime(date_str)
-                    if msg_date.tzinfo:
-                        msg_date = msg_date.replace(tzinfo=None)
-                except Exception:
-                    pass
-
-        return subject, sender, msg_date
+        return parse_header_fields(header_data)
 
     except Exception:
         return "", "", None
 
 
-def search_messages(imap, folder, search_criteria):
+def compact_uid_set(uids):
+    """
+    Collapse a list of UIDs into an IMAP sequence set using ranges.
+
+    ['1', '2', '3', '7', '9', '10'] -> '1:3,7,9:10'
+    """
+    nums = sorted(set(int(uid) for uid in uids))
+    if not nums:
+        return ""
+
+    tokens = []
+    run_start = prev = nums[0]
+    for num in nums[1:]:
+        if num == prev + 1:
+            prev = num
+            continue
+        tokens.append(f"{run_start}:{prev}" if prev > run_start else str(run_start))
+        run_start = prev = num
+    tokens.append(f"{run_start}:{prev}" if prev > run_start else str(run_start))
+
+    return ",".join(tokens)
+
+
+def split_fetch_response(data):
+    """
+    Group a multi-message FETCH response by UID.
+
+    imaplib returns each message as one or more (envelope, literal) tuples
+    followed by a closing bytes item; the UID can appear in any of them.
+
+    Returns:
+        {uid: [(envelope, literal), ...]}
+    """
+    messages = {}
+    uid = None
+    parts = []
+
+    for item in data or []:
+        if isinstance(item, tuple):
+            match = FETCH_UID_RE.search(item[0])
+            if match:
+                uid = match.group(1).decode()
+            parts.append(item)
+            continue
+
+        # Closing item, e.g. b')' or b' UID 1234)'
+        if item:
+            match = FETCH_UID_RE.search(item)
+            if match:
+                uid = match.group(1).decode()
+        if uid is not None and parts:
+            messages[uid] = parts
+        uid = None
+        parts = []
+
+    if uid is not None and parts:
+        messages[uid] = parts
+
+    return messages
+
+
+def open_header_cache(config):
+    """
+    Open the on-disk header cache for this account.
+
+    Subject/From/Date are keyed by (folder, UIDVALIDITY, UID), so messages
+    kept by an exclusion aren't re-fetched on every run. If the server
+    renumbers a folder its UIDVALIDITY changes, and the old rows simply
+    stop matching.
+
+    Returns:
+        sqlite3 connection, or None if the cache can't be opened
+    """
+    try:
+        os.makedirs(HEADER_CACHE_DIR, mode=0o700, exist_ok=True)
+        account = hashlib.sha1(config["email"].lower().encode()).hexdigest()
+        cache = sqlite3.connect(os.path.join(HEADER_CACHE_DIR, f"{account}.sqlite"), timeout=30)
+        cache.execute(
+            "CREATE TABLE IF NOT EXISTS headers ("
+            "folder TEXT, uidvalidity TEXT, uid INTEGER, subject TEXT, sender TEXT, date TEXT, "
+            "PRIMARY KEY (folder, uidvalidity, uid))"
+        )
+        return cache
+    except (OSError, sqlite3.Error) as e:
+        print(f"  Header cache unavailable ({e}), fetching all headers from the server")
+        return None
+
+
+def read_cached_headers(cache, imap, uids):
+    """Look up cached headers for UIDs in the currently selected folder."""
+    wanted = set(int(uid) for uid in uids)
+    rows = cache.execute(
+        "SELECT uid, subject, sender, date FROM headers "
+        "WHERE folder = ? AND uidvalidity = ? AND uid BETWEEN ? AND ?",
+        (imap.folder, imap.uidvalidity, min(wanted), max(wanted))
+    )
+    return {str(uid): (subject, sender, datetime.fromisoformat(date) if date else None)
+            for uid, subject, sender, date in rows if uid in wanted}
+
+
+def write_cached_headers(cache, imap, headers):
+    """Store freshly fetched {uid: (subject, sender, date)} headers."""
+    with cache:
+        cache.executemany(
+            "INSERT OR REPLACE INTO headers VALUES (?, ?, ?, ?, ?, ?)",
+            [(imap.folder, imap.uidvalidity, int(uid), subject, sender,
+              date.isoformat() if date else None)
+             for uid, (subject, sender, date) in headers.items()]
+        )
+
+
+def forget_cached_headers(cache, imap, uids):
+    """Drop cache rows for messages that have been deleted."""
+    with cache:
+        cache.executemany(
+            "DELETE FROM headers WHERE folder = ? AND uidvalidity = ? AND uid = ?",
+            [(imap.folder, imap.uidvalidity, int(uid)) for uid in uids]
+        )
+
+
+def get_message_headers_bulk(imap, uids, cache=None):
+    """
+    Fetch Subject, From and Date headers for a batch of UIDs in one FETCH.
+
+    Args:
+        imap: ImapSession with the folder selected
+        uids: List of message UIDs
+        cache: Optional header cache from open_header_cache(); cached UIDs
+               are not fetched again
+
+    Returns:
+        {uid: (subject, sender, date)} - UIDs the server didn't return are absent
+    """
+    if not uids:
+        return {}
+
+    use_cache = cache is not None and imap.uidvalidity is not None
+    headers = read_cached_headers(cache, imap, uids) if use_cache else {}
+    missing = [uid for uid in uids if uid not in headers]
+    if not missing:
+        return headers
+
+    status, data = imap.uid('FETCH', compact_uid_set(missing), '(BODY.PEEK[HEADER.FIELDS (Subject From Date)])')
+    if status != 'OK':
+        raise imaplib.IMAP4.error(f"Header fetch failed: {status}")
+
+    fetched = {uid: parse_header_fields(parts[0][1])
+               for uid, parts in split_fetch_response(data).items()}
+    if use_cache:
+        write_cached_headers(cache, imap, fetched)
+
+    headers.update(fetched)
+    return headers
+
+
+# Full message only - the Date used for organizing is read from its own
+# header block. BODY.PEEK[] (rather than RFC822) so backing up doesn't mark
+# anything as read.
+MESSAGE_FETCH_SPEC = '(BODY.PEEK[])'
+
+
+def parse_message_fetch(status, data):
+    """
+    Parse the response to a MESSAGE_FETCH_SPEC fetch.
+
+    Returns:
+        {uid: (content, msg_date)} - UIDs the server didn't return are absent
+    """
+    if status != 'OK':
+        raise imaplib.IMAP4.error(f"Message fetch failed: {status}")
+
+    messages = {}
+    for uid, parts in split_fetch_response(data).items():
+        content = parts[0][1]
+        if content is None:
+            continue
+        # Only scan the header block, not the (possibly huge) body
+        header_end = content.find(b'\r\n\r\n')
+        _, _, msg_date = parse_header_fields(content[:header_end] if header_end >= 0 else content)
+        messages[uid] = (content, msg_date)
+
+    return messages
+
+
+def search_messages(imap, folder, search_criteria, readonly=False):
     """
     Search for messages in a folder matching criteria.
 
+    Args:
+        imap: ImapSession connection
+        folder: IMAP folder to search
+        search_criteria: IMAP SEARCH string
+        readonly: Open the folder with EXAMINE (for runs that won't delete)
+
     Returns:
         List of message UIDs
     """
     try:
-        status, _ = imap.select(f'"{folder}"')
+        status, _ = imap.select(folder, readonly)
         if status != 'OK':
             print(f"  Could not select folder: {folder}")
             return []
@@ -285,26 +891,82 @@ def search_messages(imap, folder, search_criteria):
         return []
 
 
-def delete_messages_batch(imap, uids):
-    """Mark messages as deleted and expunge."""
-    uid_set = ','.join(uids)
+def purge_messages(imap, uid_set):
+    """Flag messages \\Deleted and expunge them - permanent."""
     status, _ = imap.uid('STORE', uid_set, '+FLAGS', '(\\Deleted)')
     if status != 'OK':
         raise Exception(f"Failed to flag messages for deletion")
-    imap.expunge()
+    imap.expunge_uids(uid_set)
+
+
+def delete_messages_batch(imap, uids, trashed=None):
+    """
+    Delete a batch of messages by moving them to Trash.
+
+    In Gmail, expunging from a label folder only removes that label - the
+    message stays in All Mail. Moving to Trash is what actually deletes it,
+    and the Trash copies are purged once at the end of the run (empty_trash).
+    Messages that are already in Trash are purged straight away.
+
+    Args:
+        imap: ImapSession connection
+        uids: List of message UIDs in the selected folder
+        trashed: List to collect the batch's UID set in Trash into
+    """
+    uid_set = compact_uid_set(uids)
+    if imap.folder == TRASH_FOLDER:
+        purge_messages(imap, uid_set)
+        return
+
+    trash_uids = imap.move_uids(uid_set, TRASH_FOLDER)
+    if trash_uids and trashed is not None:
+        trashed.append(trash_uids)
+
+
+def empty_trash(imap, trashed, chunk_size=100):
+    """
+    Permanently delete the messages this run moved to Trash.
+    Only those UIDs are touched - anything else in Trash is left alone.
+
+    Args:
+        imap: ImapSession connection
+        trashed: UID sets in Trash collected by delete_messages_batch
+        chunk_size: UID sets per STORE/EXPUNGE command
+    """
+    if not trashed:
+        return
+
+    print(f"\nEmptying deleted messages from {TRASH_FOLDER}...")
+    status, _ = imap.select(TRASH_FOLDER)
+    if status != 'OK':
+        print(f"  Could not select {TRASH_FOLDER} - Gmail will purge it after 30 days.")
+        return
+
+    for start in range(0, len(trashed), chunk_size):
+        purge_messages(imap, ",".join(trashed[start:start + chunk_size]))
+    print("  Done.")
+
 
+def close_zip_files(zip_handles):
+    """Close (and so finalize) every open ZIP file and forget the handles."""
+    for zf in zip_handles.values():
+        zf.close()
+    zip_handles.clear()
 
-def backup_emails_to_zip(imap, folder, uids, output_dir, delete_after=False, config=None):
+
+def backup_emails_to_zip(imap, folder, uids, output_dir, delete_after=False, config=None,
+                         trashed=None):
     """
     Backup emails to monthly ZIP files containing EML files.
 
     Args:
-        imap: IMAP connection
+        imap: ImapSession connection
         folder: Current IMAP folder
         uids: List of message UIDs to backup
         output_dir: Directory to write ZIP files to
         delete_after: If True, delete each batch after backing up
         config: Configuration dict
+        trashed: List collecting Trash UID sets for empty_trash()
 
     Returns:
         (backed_up, deleted) tuple
@@ -316,34 +978,78 @@ def backup_emails_to_zip(imap, folder, uids, output_dir, delete_after=False, con
     if delete_after:
         print("(Will delete each batch after backup)")
 
-    batch_size = config.get("BATCH_SIZE", 100) if config else 100
+    max_batch_size = config.get("BATCH_SIZE", 100) if config else 100
+    batch_size = max_batch_size
+    avg_size = None  # Running average (EWMA) of message size, for sizing batches
     zip_email_counts = defaultdict(int)
 
+    # IMAP hands over messages as-is, so the EMLs are mostly plain text
+    # headers and bodies: deflate at level 1 keeps most of the saving of
+    # higher levels while staying well ahead of the download
+    compress_level = config.get("ZIP_COMPRESS_LEVEL", 1) if config else 1
+    if compress_level:
+        zip_options = {"compression": zipfile.ZIP_DEFLATED, "compresslevel": compress_level}
+    else:
+        zip_options = {"compression": zipfile.ZIP_STORED}
+
     backed_up = 0
     deleted = 0
     consecutive_failures = 0
     max_failures = 5
 
-    for batch_start in range(0, total, batch_size):
-        batch_end = min(batch_start + batch_size, total)
-        batch_uids = uids[batch_start:batch_end]
+    # Batch FETCHes are pipelined: while one batch is being written to disk
+    # the server is already streaming the next ones.
+    in_flight = deque()  # [(batch_uids, ticket), ...]
+    fetched = {}  # {uid: (content, msg_date)} - may run ahead of the current batch
+    next_start = 0
+    batch_start = 0
+
+    zip_handles = {}  # {zip_filename: ZipFile} - kept open across batches
+    known_zips = set()  # Archives already on disk, so reopening needs no stat()
+    try:
+        while batch_start < total:
+            while next_start < total and len(in_flight) < PIPELINE_WINDOW:
+                next_uids = uids[next_start:next_start + batch_size]
+                ticket = imap.send_uid_fetch(compact_uid_set(next_uids), MESSAGE_FETCH_SPEC)
+                in_flight.append((next_uids, ticket))
+                next_start += len(next_uids)
+
+            batch_uids, ticket = in_flight.popleft()
+            batch_end = batch_start + len(batch_uids)
 
-        print(f"\nProcessing batch {batch_start + 1}-{batch_end} ({backed_up:,}/{total:,} done)...")
+            log(f"\nProcessing batch {batch_start + 1}-{batch_end} ({backed_up:,}/{total:,} done)...", "debug")
 
-        batch_emails = []
-        batch_successful_uids = []
+            batch_emails = []
+            batch_successful_uids = []
 
-        for i, uid in enumerate(batch_uids):
             try:
-                # Fetch full message
-                status, data = imap.uid('FETCH', uid, '(RFC822)')
-                if status != 'OK' or not data or not data[0]:
+                fetched.update(parse_message_fetch(*imap.read_uid_fetch(ticket)))
+            except Exception as e:
+                log(f"  Fetch failed for batch: {e}")
+                consecutive_failures += 1
+                if consecutive_failures >= max_failures:
+                    log("Too many failures, stopping.")
+                    break
+                batch_start = batch_end
+                continue
+
+            batch_messages = {uid: fetched.pop(uid) for uid in batch_uids if uid in fetched}
+
+            # Size upcoming batches so one response stays around FETCH_TARGET_BYTES,
+            # even in folders full of large attachments
+            if batch_messages:
+                batch_avg = sum(len(content) for content, _ in batch_messages.values()) / len(batch_messages)
+                avg_size = batch_avg if avg_size is None else 0.7 * avg_size + 0.3 * batch_avg
+                new_batch_size = min(max_batch_size, max(MIN_FETCH_BATCH, int(FETCH_TARGET_BYTES // max(avg_size, 1))))
+                if new_batch_size != batch_size:
+                    log(f"  Batch size now {new_batch_size} (avg message {avg_size / 1024:.0f} KB)", "debug")
+                    batch_size = new_batch_size
+
+            for uid in batch_uids:
+                if uid not in batch_messages:
                     continue
+                content, msg_date = batch_messages[uid]
 
-                content = data[0][1] if isinstance(data[0], tuple) else data[0]
-
-                # Get date for organizing
-                _, _, msg_date = get_message_headers(imap, uid)
                 if msg_date:
                     year, month = msg_date.year, msg_date.month
                     date_str = msg_date.strftime('%Y%m%d')
@@ -357,53 +1063,54 @@ def backup_emails_to_zip(imap, folder, uids, output_dir, delete_after=False, con
                 batch_emails.append((zip_filename, eml_filename, content))
                 batch_successful_uids.append(uid)
 
-                if (i + 1) % 20 == 0:
-                    print(f"  Downloaded {i + 1}/{len(batch_uids)}...")
+            log(f"  Downloaded {len(batch_emails)}/{len(batch_uids)}...", "debug")
 
-            except Exception as e:
-                print(f"  Error on UID {uid}: {e}")
-                consecutive_failures += 1
-                if consecutive_failures >= max_failures:
-                    break
-
-        if consecutive_failures >= max_failures:
-            print("Too many failures, stopping.")
-            break
+            # Write batch to ZIP files
+            batch_by_zip = defaultdict(list)
+            for zip_filename, eml_filename, content in batch_emails:
+                batch_by_zip[zip_filename].append((eml_filename, content))
 
-        # Write batch to ZIP files
-        batch_by_zip = defaultdict(list)
-        for zip_filename, eml_filename, content in batch_emails:
-            batch_by_zip[zip_filename].append((eml_filename, content))
-
-        for zip_filename, emails in batch_by_zip.items():
-            mode = 'a' if os.path.exists(zip_filename) else 'w'
-            with zipfile.ZipFile(zip_filename, mode, zipfile.ZIP_DEFLATED) as zf:
+            for zip_filename, emails in batch_by_zip.items():
+                zf = zip_handles.get(zip_filename)
+                if zf is None:
+                    mode = 'a' if zip_filename in known_zips or os.path.exists(zip_filename) else 'w'
+                    zf = zip_handles[zip_filename] = zipfile.ZipFile(
+                        zip_filename, mode, allowZip64=True, **zip_options)
+                    known_zips.add(zip_filename)
                 for eml_filename, content in emails:
                     zf.writestr(eml_filename, content)
-            zip_email_counts[zip_filename] += len(emails)
+                zip_email_counts[zip_filename] += len(emails)
 
-        backed_up += len(batch_emails)
-        consecutive_failures = 0
+            backed_up += len(batch_emails)
+            consecutive_failures = 0
 
-        # Delete batch if requested
-        if delete_after and batch_successful_uids:
-            print(f"  Deleting {len(batch_successful_uids)} messages...")
-            try:
-                delete_messages_batch(imap, batch_successful_uids)
-                deleted += len(batch_successful_uids)
-                print(f"  Deleted {len(batch_successful_uids)} messages.")
-            except Exception as e:
-                print(f"  Delete failed: {e}")
-                consecutive_failures += 1
+            # Delete batch if requested
+            if delete_after and batch_successful_uids:
+                # Finalize the archives before their emails leave the server
+                close_zip_files(zip_handles)
+                log(f"  Deleting {len(batch_successful_uids)} messages...", "debug")
+                try:
+                    delete_messages_batch(imap, batch_successful_uids, trashed)
+                    deleted += len(batch_successful_uids)
+                    log(f"  Deleted {len(batch_successful_uids)} messages.", "debug")
+                except Exception as e:
+                    log(f"  Delete failed: {e}")
+                    consecutive_failures += 1
 
-        print(f"  Progress: {backed_up:,}/{total:,} ({100*backed_up/total:.1f}%)")
+            status = f"  Progress: {backed_up:,}/{total:,} ({100*backed_up/total:.1f}%)"
+            progress(status + (f", {deleted:,} deleted" if delete_after else ""))
 
-        # Brief pause between batches
-        if batch_end < total:
-            time.sleep(0.5)
+            batch_start = batch_end
+
+            # Keep the connection warm between batches
+            if batch_end < total:
+                imap.keepalive()
+    finally:
+        close_zip_files(zip_handles)
+        imap.discard_fetches()
 
     # Print summary
-    print(f"\nBackup complete:")
+    log(f"\nBackup complete:")
     for zip_filename in sorted(zip_email_counts.keys()):
         count = zip_email_counts[zip_filename]
         size_mb = os.path.getsize(zip_filename) / 1024 / 1024
@@ -418,15 +1125,16 @@ def backup_emails_to_zip(imap, folder, uids, output_dir, delete_after=False, con
     return backed_up, deleted
 
 
-def delete_messages_robust(imap, folder, uids, config):
+def delete_messages_robust(imap, folder, uids, config, trashed=None):
     """
     Delete messages with robust error handling and exclusion support.
 
     Args:
-        imap: IMAP connection
+        imap: ImapSession connection
         folder: Current IMAP folder
         uids: List of message UIDs to delete
         config: Configuration dict
+        trashed: List collecting Trash UID sets for empty_trash()
 
     Returns:
         Total deleted count
@@ -435,9 +1143,13 @@ def delete_messages_robust(imap, folder, uids, config):
     consecutive_failures = 0
     max_failures = 10
 
-    # Parse exclusions
+    # Parse exclusions - every pattern is checked here, per message, even
+    # the ones the IMAP search already applied (Gmail matches whole words)
     subject_keywords, sender_patterns = parse_exclusions(config)
-    has_exclusions = subject_keywords or sender_patterns
+    subject_re, sender_re = compile_exclusions(subject_keywords, sender_patterns)
+    has_exclusions = subject_re or sender_re
+    # Opened here rather than shared: each folder worker runs in its own thread
+    cache = open_header_cache(config) if has_exclusions else None
 
     total = len(uids)
     deleted = 0
@@ -446,87 +1158,133 @@ def delete_messages_robust(imap, folder, uids, config):
 
     while batch_start < total:
         if consecutive_failures >= max_failures:
-            print(f"Too many consecutive failures ({max_failures}), stopping.")
+            log(f"Too many consecutive failures ({max_failures}), stopping.")
             break
 
         batch_end = min(batch_start + batch_size, total)
         batch_uids = uids[batch_start:batch_end]
 
-        print(f"\nProcessing batch {batch_start + 1}-{batch_end} ({deleted:,}/{total:,} done)...")
+        log(f"\nProcessing batch {batch_start + 1}-{batch_end} ({deleted:,}/{total:,} done)...", "debug")
 
         try:
             # Filter by exclusions if needed
             uids_to_delete = []
 
             if has_exclusions:
+                batch_headers = get_message_headers_bulk(imap, batch_uids, cache)
                 for uid in batch_uids:
-                    subject, sender, _ = get_message_headers(imap, uid)
-                    if should_exclude(subject, sender, subject_keywords, sender_patterns):
+                    subject, sender, _ = batch_headers.get(uid, ("", "", None))
+                    if should_exclude(subject, sender, subject_re, sender_re):
                         skipped += 1
                         if skipped <= 10:
-                            print(f"  KEPT: \"{subject[:50]}\" from {sender[:40]}")
-                        elif skipped == 11:
-                            print(f"  (suppressing further exclusion messages...)")
+                            log(f"  KEPT: \"{subject[:50]}\" from {sender[:40]}")
+                        elif not VERBOSE and skipped == 11:
+                            log(f"  (suppressing further exclusion messages, use --verbose to see all...)")
+                        else:
+                            log(f"  KEPT: \"{subject[:50]}\" from {sender[:40]}", "debug")
                     else:
                         uids_to_delete.append(uid)
             else:
                 uids_to_delete = batch_uids
 
             if uids_to_delete:
-                delete_messages_batch(imap, uids_to_delete)
+                delete_messages_batch(imap, uids_to_delete, trashed)
                 deleted += len(uids_to_delete)
-                print(f"  Deleted {len(uids_to_delete)} messages.")
+                log(f"  Deleted {len(uids_to_delete)} messages.", "debug")
+                if cache is not None:
+                    forget_cached_headers(cache, imap, uids_to_delete)
 
             consecutive_failures = 0
             batch_start = batch_end
+            progress(f"  {folder}: {deleted:,}/{total:,} deleted ({100*batch_end/total:.1f}% checked)")
 
         except imaplib.IMAP4.error as e:
             consecutive_failures += 1
             wait_time = min(30 * consecutive_failures, 120)
-            print(f"  IMAP error: {e}")
-            print(f"  Waiting {wait_time} seconds before retry...")
+            log(f"  IMAP error: {e}")
+            log(f"  Waiting {wait_time} seconds before retry...")
             time.sleep(wait_time)
 
-            # Reconnect
+            # Reconnect (re-selects the folder)
             try:
-                imap = connect_imap(config)
-                imap.select(f'"{folder}"')
-                print("  Reconnected.")
+                imap.reconnect()
+                log("  Reconnected.")
             except Exception as re:
-                print(f"  Reconnect failed: {re}")
+                log(f"  Reconnect failed: {re}")
 
         except (ConnectionResetError, ConnectionError, OSError) as e:
             consecutive_failures += 1
             wait_time = min(30 * consecutive_failures, 120)
-            print(f"  Connection error: {e}")
-            print(f"  Waiting {wait_time} seconds before retry...")
+            log(f"  Connection error: {e}")
+            log(f"  Waiting {wait_time} seconds before retry...")
             time.sleep(wait_time)
 
-            # Reconnect
+            # Reconnect (re-selects the folder)
             try:
-                imap = connect_imap(config)
-                imap.select(f'"{folder}"')
-                print("  Reconnected.")
+                imap.reconnect()
+                log("  Reconnected.")
             except Exception as re:
-                print(f"  Reconnect failed: {re}")
+                log(f"  Reconnect failed: {re}")
 
         except Exception as e:
             consecutive_failures += 1
             wait_time = min(30 * consecutive_failures, 120)
-            print(f"  Unexpected error: {e}")
-            print(f"  Waiting {wait_time} seconds before retry...")
+            log(f"  Unexpected error: {e}")
+            log(f"  Waiting {wait_time} seconds before retry...")
             time.sleep(wait_time)
 
-        # Brief pause between successful batches
+        # Keep the connection warm between successful batches
         if consecutive_failures == 0 and batch_start < total:
-            time.sleep(0.5)
+            imap.keepalive()
+
+    if cache is not None:
+        cache.close()
 
     if skipped > 0:
-        print(f"\nExcluded {skipped:,} messages matching filters")
+        log(f"\nExcluded {skipped:,} messages matching filters")
 
     return deleted
 
 
+def run_per_folder(imap, config, folders, work, parallel=True):
+    """
+    Run work(imap, folder) for each folder.
+
+    Folders are independent, so with parallel=True each one gets its own
+    IMAP session on a small thread pool. Otherwise they run one after
+    another on the given session.
+
+    Returns:
+        {folder: result} in the order given - the exception instead, for a
+        folder whose work raised, so it can't pass for an empty result
+    """
+    if not parallel or len(folders) <= 1:
+        results = {}
+        for folder in folders:
+            try:
+                results[folder] = work(imap, folder)
+            except Exception as e:
+                log(f"  {folder}: failed: {e}")
+                results[folder] = e
+        return results
+
+    def run(folder):
+        session = ImapSession(config)
+        try:
+            session.connect()
+            return work(session, folder)
+        except Exception as e:
+            log(f"  {folder}: failed: {e}")
+            return e
+        finally:
+            session.logout()
+
+    with ThreadPoolExecutor(max_workers=min(len(folders), MAX_FOLDER_WORKERS)) as pool:
+        futures = {folder: pool.submit(run, folder) for folder in folders}
+
+    return {folder: future.result() for folder, future in futures.items()}
+
+
 def main():
     import argparse
     parser = argparse.ArgumentParser(
@@ -553,8 +1311,15 @@ Examples:
                         help="Backup emails to monthly ZIP files (add --delete to also delete)")
     parser.add_argument("--safe", action="store_true",
                         help="Safety mode: backup first, smaller batches, extra confirmations")
+    parser.add_argument("--no-parallel", action="store_true",
+                        help="Process folders one at a time (easier to read output)")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Log every batch instead of a single progress line")
     args = parser.parse_args()
 
+    global VERBOSE, TRASH_FOLDER
+    VERBOSE = args.verbose
+
     print("=" * 60)
     print("GmailByeBye Simple - Gmail IMAP Email Cleanup")
     print("(App Password version - no OAuth needed)")
@@ -607,7 +1372,8 @@ Examples:
     # Connect
     print(f"\nConnecting to {IMAP_SERVER}...")
     try:
-        imap = connect_imap(config)
+        imap = ImapSession(config)
+        imap.connect()
     except imaplib.IMAP4.error as e:
         print(f"Login failed: {e}")
         print("\nCheck your email and App Password.")
@@ -616,8 +1382,10 @@ Examples:
 
     print(f"Logged in as {config['email']}")
 
-    # Get folders to process
-    folders = get_mailbox_folders(config)
+    # Get folders to process, using this account's actual system folder names
+    special_folders = find_special_folders(imap)
+    TRASH_FOLDER = special_folders.get("TRASH", TRASH_FOLDER)
+    folders = get_mailbox_folders(config, special_folders)
     print(f"Target folders: {', '.join(folders)}")
 
     # Build search criteria
@@ -630,7 +1398,7 @@ Examples:
     if subject_keywords or sender_patterns:
         exclusion_count = len(subject_keywords or []) + len(sender_patterns or [])
         print(f"\n  Active exclusion filters ({exclusion_count} patterns):")
-        print(f"  NOTE: Each message will be checked before deletion (slower).")
+        print(f"  NOTE: all {exclusion_count} pattern(s) are checked per message before deletion (slower).")
         if subject_keywords:
             print(f"  Excluding subjects containing: {', '.join(subject_keywords)}")
         if sender_patterns:
@@ -640,15 +1408,25 @@ Examples:
     all_results = {}  # {folder: [uids]}
     total_found = 0
 
+    print(f"\nSearching {len(folders)} folder(s)...")
+    search_results = run_per_folder(
+        imap, config, folders,
+        lambda session, folder: search_messages(session, folder, search_criteria, readonly=not args.delete),
+        parallel=not args.no_parallel
+    )
+
+    failed_folders = []  # Folders whose search raised - never "no matching messages"
     for folder in folders:
-        print(f"\nSearching {folder}...")
-        uids = search_messages(imap, folder, search_criteria)
-        if uids:
+        uids = search_results[folder]
+        if isinstance(uids, Exception):
+            failed_folders.append(folder)
+            print(f"  {folder}: search FAILED ({uids})")
+        elif uids:
             all_results[folder] = uids
             total_found += len(uids)
-            print(f"  Found {len(uids):,} messages")
+            print(f"  {folder}: found {len(uids):,} messages")
         else:
-            print(f"  No matching messages")
+            print(f"  {folder}: no matching messages")
 
     print()
     print("=" * 60)
@@ -656,9 +1434,16 @@ Examples:
     for folder, uids in all_results.items():
         print(f"  {folder}: {len(uids):,} messages")
     print(f"  TOTAL to DELETE: {total_found:,}")
+    if failed_folders:
+        print(f"  NOT SEARCHED (failed): {', '.join(failed_folders)}")
     print("=" * 60)
 
     if total_found == 0:
+        if failed_folders:
+            print("\nNothing to delete in the folders that could be searched.")
+            print(f"Search FAILED in: {', '.join(failed_folders)} - run again to retry them.")
+            imap.logout()
+            sys.exit(1)
         print(f"\nNothing to delete! No emails match: {description}")
         imap.logout()
         return
@@ -693,22 +1478,27 @@ Examples:
 
         total_backed_up = 0
         total_deleted = 0
+        trashed = []
 
         for folder, uids in all_results.items():
             print(f"\n--- Processing {folder} ---")
-            imap.select(f'"{folder}"')
+            imap.select(folder, readonly=not args.delete)  # No-op if the search left it selected
             backed_up, deleted_count = backup_emails_to_zip(
                 imap, folder, uids, args.backup,
-                delete_after=args.delete, config=config
+                delete_after=args.delete, config=config, trashed=trashed
             )
             total_backed_up += backed_up
             total_deleted += deleted_count
 
+        empty_trash(imap, trashed)
+
         print("\n" + "=" * 60)
         print("COMPLETE!")
         print(f"Backed up {total_backed_up:,} messages")
         if args.delete:
             print(f"Deleted {total_deleted:,} messages")
+        if failed_folders:
+            print(f"Search FAILED in: {', '.join(failed_folders)} - run again to retry them")
         print("=" * 60)
         imap.logout()
         return
@@ -716,6 +1506,8 @@ Examples:
     # No backup requested
     if not args.delete:
         print(f"\n[DRY RUN] Would delete {total_found:,} messages ({description})")
+        if failed_folders:
+            print(f"  (not counting {', '.join(failed_folders)}, where the search failed)")
         print("\nTo actually delete, run with --delete or --unhinged")
         imap.logout()
         return
@@ -735,16 +1527,30 @@ Examples:
     print(f"DELETING {description}...")
     print("=" * 60)
 
-    grand_total = 0
-    for folder, uids in all_results.items():
-        print(f"\n--- Processing {folder} ({len(uids):,} messages) ---")
-        imap.select(f'"{folder}"')
-        folder_deleted = delete_messages_robust(imap, folder, uids, config)
-        grand_total += folder_deleted
+    trashed = []  # Shared by the folder workers; list.append is atomic
+
+    def delete_folder(session, folder):
+        uids = all_results[folder]
+        log(f"\n--- Processing {folder} ({len(uids):,} messages) ---")
+        session.select(folder)
+        return delete_messages_robust(session, folder, uids, config, trashed)
+
+    deleted_by_folder = run_per_folder(
+        imap, config, list(all_results), delete_folder,
+        parallel=not args.no_parallel
+    )
+    grand_total = sum(count for count in deleted_by_folder.values() if not isinstance(count, Exception))
+    failed_deletes = [folder for folder, count in deleted_by_folder.items() if isinstance(count, Exception)]
+
+    empty_trash(imap, trashed)
 
     print("\n" + "=" * 60)
     print("COMPLETE!")
     print(f"Deleted {grand_total:,} messages")
+    if failed_deletes:
+        print(f"Deleting FAILED in: {', '.join(failed_deletes)} - run again to finish them")
+    if failed_folders:
+        print(f"Search FAILED in: {', '.join(failed_folders)} - run again to retry them")
     print("=" * 60)
 
     imap.logout()
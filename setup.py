@@ -68,10 +68,21 @@ def ask_yes_no(prompt, default=True):
 
 
 def secure_write(filepath, content):
-    """Write file with owner-only permissions."""
-    with open(filepath, 'w') as f:
+    """
+    Write file with owner-only permissions.
+
+    The file is created 600 from the start (never world-readable, even
+    briefly) as a fresh temp file, then renamed over any existing config.
+    """
+    tmp_file = filepath + ".tmp"
+    try:
+        os.unlink(tmp_file)  # O_EXCL below must create it with our permissions
+    except FileNotFoundError:
+        pass
+    fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, stat.S_IRUSR | stat.S_IWUSR)
+    with os.fdopen(fd, 'w') as f:
         f.write(content)
-    os.chmod(filepath, stat.S_IRUSR | stat.S_IWUSR)  # 600
+    os.replace(tmp_file, filepath)
     print(f"  Wrote {filepath} (permissions: 600)")
 
 
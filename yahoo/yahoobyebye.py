@@ -4,6 +4,7 @@ Yahoo Email Cleanup via POP3 - FAST VERSION
 Uses binary search to find the cutoff point, then bulk deletes.
 """
 import poplib
+import re
 import ssl
 import stat
 from email.utils import parsedate_to_datetime
@@ -13,13 +14,34 @@ import time
 import sys
 import os
 import zipfile
-from collections import defaultdict
+import random
+import json
+from collections import defaultdict, deque
 
 # Config
 POP3_SERVER = "pop.mail.yahoo.com"
 POP3_PORT = 995 
 CONFIG_FILE_LOCAL = ".yahoo_cleanup_config"
 CONFIG_FILE_HOME = os.path.expanduser("~/.yahoo_cleanup_config")
+DATE_CACHE_FILE = os.path.expanduser("~/.yahoo_cleanup_dates.json")
+PIPELINE_DEPTH = 100  # Commands sent per write before reading their replies
+BATCHES_PER_SESSION = 10  # Delete batches marked per connection before QUIT commits them
+MAX_BATCHES_PER_SESSION = 100  # Ceiling when commits keep succeeding quickly (5,000 DELEs at 50)
+SLOW_COMMIT_SECONDS = 10  # Commits slower than this (on average) stop sessions growing
+BACKUP_BATCH_SIZE = 50  # Messages downloaded (and, if deleting, committed) per backup batch
+MAX_BACKUP_BATCH_SIZE = 200  # Ceiling for backup-and-delete batches, which grow while commits succeed
+SEARCH_SWEEP_SIZE = 32  # Search brackets this small are fetched in one pipelined round-trip
+SMALL_MAILBOX_SIZE = 2 * PIPELINE_DEPTH  # Mailboxes this small have every date fetched up front
+PROGRESS_INTERVAL = 0.5  # Seconds between in-place progress redraws on a terminal
+
+# Built once - loading the CA bundle costs ~40ms, and deletes reconnect often
+SSL_CONTEXT = ssl.create_default_context()
+SSL_CONTEXT.minimum_version = ssl.TLSVersion.TLSv1_2
+
+# The canonical RFC 5322 date shape, e.g. b'Wed, 25 Dec 2024 03:14:15 +0000'
+DATE_VALUE_RE = re.compile(rb'(\d{1,2}) ([A-Za-z]{3}) (\d{4}) (\d\d):(\d\d):(\d\d)')
+MONTHS = {name: num for num, name in enumerate(
+    [b'jan', b'feb', b'mar', b'apr', b'may', b'jun', b'jul', b'aug', b'sep', b'oct', b'nov', b'dec'], 1)}
 
 # Defaults
 DEFAULT_CONFIG = {
@@ -31,6 +53,82 @@ DEFAULT_CONFIG = {
     "EXCLUDE_SENDERS": None,  # Comma-separated, supports *@domain.com wildcards
 }
 
+
+_progress_shown = False  # A \r progress line is on screen and needs ending
+_progress_drawn_at = 0.0  # time.monotonic() of the last redraw
+_progress_pending = None  # Latest progress line skipped by the redraw limit
+
+
+def log(msg):
+    """Print a message, ending any progress line first (brought up to date)."""
+    global _progress_shown, _progress_pending
+    if _progress_shown:
+        if _progress_pending is not None:
+            print(f"\r{_progress_pending}\033[K", end="")
+            _progress_pending = None
+        print()
+        _progress_shown = False
+    print(msg)
+
+
+def progress(msg):
+    """
+    Show a progress line. On a terminal it is rewritten in place, so long
+    delete runs don't scroll a line per batch; otherwise it's printed normally.
+    Redraws are limited to one per PROGRESS_INTERVAL, since flushing to a
+    slow console can cost more than the batch it reports.
+    """
+    global _progress_shown, _progress_drawn_at, _progress_pending
+    if not sys.stdout.isatty():
+        log(msg)
+        return
+    now = time.monotonic()
+    if _progress_shown and now - _progress_drawn_at < PROGRESS_INTERVAL:
+        _progress_pending = msg
+        return
+    print(f"\r{msg}\033[K", end="", flush=True)
+    _progress_shown = True
+    _progress_drawn_at = now
+    _progress_pending = None
+
+
+def string_setting(name):
+    """Config handler storing the value as-is under name."""
+    def apply(config, value):
+        config[name] = value
+    return apply
+
+
+def int_setting(name, is_valid, warning):
+    """Config handler storing an int under name, or printing warning if invalid."""
+    def apply(config, value):
+        val = int(value)
+        if is_valid(val):
+            config[name] = val
+        else:
+            print(warning)
+    return apply
+
+
+def ignore_setting(config, value):
+    """Config handler for unknown keys."""
+
+
+# Config file key -> handler(config, value)
+CONFIG_HANDLERS = {
+    "YAHOO_EMAIL": string_setting("email"),
+    "YAHOO_APP_PASSWORD": lambda config, value: config.update(password=value.replace(" ", "")),
+    "CUTOFF_DATE": string_setting("CUTOFF_DATE"),
+    "YEARS_OLD": int_setting("YEARS_OLD", lambda val: val >= 0,
+                             "Warning: YEARS_OLD cannot be negative, using default (1)"),
+    "BATCH_SIZE": int_setting("BATCH_SIZE", lambda val: val > 0,
+                              "Warning: BATCH_SIZE must be positive, using default (50)"),
+    "DELETE_YEARS": string_setting("DELETE_YEARS"),
+    "EXCLUDE_SUBJECTS": string_setting("EXCLUDE_SUBJECTS"),
+    "EXCLUDE_SENDERS": string_setting("EXCLUDE_SENDERS"),
+}
+
+
 def load_config():
     """Load credentials and settings from config file."""
     config = {
@@ -54,30 +152,7 @@ def load_config():
                     key = key.strip()
                     value = value.strip()
 
-                    if key == "YAHOO_EMAIL":
-                        config["email"] = value
-                    elif key == "YAHOO_APP_PASSWORD":
-                        config["password"] = value.replace(" ", "")
-                    elif key == "CUTOFF_DATE":
-                        config["CUTOFF_DATE"] = value
-                    elif key == "YEARS_OLD":
-                        val = int(value)
-                        if val < 0:
-                            print(f"Warning: YEARS_OLD cannot be negative, using default (1)")
-                        else:
-                            config["YEARS_OLD"] = val
-                    elif key == "BATCH_SIZE":
-                        val = int(value)
-                        if val <= 0:
-                            print(f"Warning: BATCH_SIZE must be positive, using default (50)")
-                        else:
-                            config["BATCH_SIZE"] = val
-                    elif key == "DELETE_YEARS":
-                        config["DELETE_YEARS"] = value
-                    elif key == "EXCLUDE_SUBJECTS":
-                        config["EXCLUDE_SUBJECTS"] = value
-                    elif key == "EXCLUDE_SENDERS":
-                        config["EXCLUDE_SENDERS"] = value
+                    CONFIG_HANDLERS.get(key, ignore_setting)(config, value)
 
         print(f"Loaded config from {config_file}")
 
@@ -103,54 +178,382 @@ def get_cutoff_date(config):
     return datetime.now() - timedelta(days=years * 365)
 
 
+class PipelinedPOP3(poplib.POP3_SSL):
+    """POP3_SSL that can send a run of commands without waiting on each reply."""
+
+    pipelining = None  # Whether the server advertises PIPELINING, checked on first use
+
+    def supports_pipelining(self):
+        """True if the server advertises PIPELINING (RFC 2449)."""
+        if self.pipelining is None:
+            try:
+                self.pipelining = 'PIPELINING' in self.capa()
+            except poplib.error_proto:
+                self.pipelining = False
+        return self.pipelining
+
+    def _getline(self):
+        """
+        Read one reply line. poplib reports the server hanging up as
+        error_proto('-ERR EOF'), the same as a refused command, so that's
+        raised as ConnectionError here instead - callers that treat -ERR
+        as "skip this message" must not skip the rest of the mailbox.
+        """
+        if self.file is None:
+            raise ConnectionError("POP3 connection is closed")
+        try:
+            return super()._getline()
+        except poplib.error_proto as e:
+            if e.args and e.args[0] == '-ERR EOF':
+                raise ConnectionError("POP3 server closed the connection") from e
+            raise
+
+    def _putline(self, line):
+        """Send one command line, see _sendall."""
+        self._sendall(line + b'\r\n')
+
+    def _sendall(self, data):
+        """Send raw bytes, raising ConnectionError if the connection was closed."""
+        if self.sock is None:
+            raise ConnectionError("POP3 connection is closed")
+        self.sock.sendall(data)
+
+    def fetch_many(self, command, msg_nums):
+        """
+        Send a multi-line command for each message, pipelined when supported.
+
+        Up to PIPELINE_DEPTH commands go out in one write and their replies
+        are read back in order; without PIPELINING it's one at a time.
+
+        Args:
+            command: Command with a %d for the message number, e.g. 'RETR %d'
+            msg_nums: Message numbers to send it for
+
+        Returns:
+            {msg_num: lines}, None for messages the server refused
+
+        Raises:
+            ConnectionError: If the connection drops (see _getline)
+        """
+        return dict(self.iter_many(command, msg_nums))
+
+    def iter_many(self, command, msg_nums):
+        """
+        Like fetch_many, but yields (msg_num, lines) as each reply is read.
+
+        Replies still unread if the caller stops early leave the session
+        out of step, so stop only by dropping the connection.
+        """
+        msg_nums = list(msg_nums)
+        depth = PIPELINE_DEPTH if self.supports_pipelining() else 1
+        for start in range(0, len(msg_nums), depth):
+            chunk = msg_nums[start:start + depth]
+            self._sendall(b''.join(b'%s\r\n' % (command % msg_num).encode('ascii')
+                                   for msg_num in chunk))
+            for msg_num in chunk:
+                try:
+                    lines = self._getlongresp()[1]
+                except poplib.error_proto:
+                    lines = None
+                yield msg_num, lines
+
+    def top_many(self, msg_nums):
+        """Fetch the headers of several messages, see fetch_many."""
+        return self.fetch_many('TOP %d 0', msg_nums)
+
+    def retr_each(self, msg_nums):
+        """
+        Fetch several whole messages, see iter_many - yields each one as it
+        arrives instead of holding the batch. A dropped connection raises
+        ConnectionError rather than coming back as a run of Nones.
+        """
+        return self.iter_many('RETR %d', msg_nums)
+
+    def dele_many(self, msg_nums):
+        """
+        Mark messages for deletion.
+
+        When the server supports PIPELINING (RFC 2449), up to PIPELINE_DEPTH
+        DELEs go out in one write and their replies are read back in order,
+        so a batch costs one round-trip instead of one per message.
+
+        Args:
+            msg_nums: Message numbers to delete
+
+        Returns:
+            {msg_num: error} for any DELE the server refused
+        """
+        failed = {}
+        if not self.supports_pipelining():
+            for msg_num in msg_nums:
+                try:
+                    self.dele(msg_num)
+                except poplib.error_proto as e:
+                    failed[msg_num] = e
+            return failed
+
+        msg_nums = list(msg_nums)
+        for start in range(0, len(msg_nums), PIPELINE_DEPTH):
+            chunk = msg_nums[start:start + PIPELINE_DEPTH]
+            self._sendall(b''.join(b'DELE %d\r\n' % msg_num for msg_num in chunk))
+            for msg_num in chunk:
+                try:
+                    self._getresp()
+                except poplib.error_proto as e:
+                    failed[msg_num] = e
+        return failed
+
+
+def backoff(attempt, base, cap):
+    """
+    Capped exponential backoff with full jitter: a random wait up to
+    base * 2^attempt, so clients throttled together don't retry together.
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
 def connect_pop3(config, timeout=60):
     """Connect to Yahoo POP3 with timeout and explicit TLS settings."""
-    ctx = ssl.create_default_context()
-    ctx.minimum_version = ssl.TLSVersion.TLSv1_2
-    pop = poplib.POP3_SSL(POP3_SERVER, POP3_PORT, timeout=timeout, context=ctx)
+    pop = PipelinedPOP3(POP3_SERVER, POP3_PORT, timeout=timeout, context=SSL_CONTEXT)
     pop.user(config["email"])
     pop.pass_(config["password"])
     return pop
 
 
-def get_message_date(pop, msg_num):
-    """Get the date of a message using TOP command."""
+def get_message_date(pop, msg_num, cache=None):
+    """
+    Get the date of a message using TOP command.
+
+    Args:
+        pop: POP3 connection
+        msg_num: Message number
+        cache: Optional {msg_num: date} dict for this session - message
+               numbers only stay stable until QUIT, so only reuse one
+               across connections via load_date_cache
+
+    Returns:
+        Naive datetime, or None if the message has no usable Date header
+        or the server refused it
+
+    Raises:
+        OSError: If the connection drops (ConnectionError for the server
+                 hanging up) - a dead socket would otherwise look like a
+                 run of dateless messages to the search
+    """
+    if cache is not None:
+        if msg_num not in cache:
+            cache[msg_num] = get_message_date(pop, msg_num)
+        return cache[msg_num]
+
     try:
         response, lines, octets = pop.top(msg_num, 0)
-        for line in lines:
-            if isinstance(line, bytes):
-                line = line.decode('utf-8', errors='replace')
-            if line.lower().startswith('date:'):
-                date_str = line[5:].strip()
-                try:
-                    dt = parsedate_to_datetime(date_str)
-                    if dt.tzinfo:
-                        dt = dt.replace(tzinfo=None)
-                    return dt
-                except (ValueError, TypeError):
-                    pass
-    except (poplib.error_proto, OSError, UnicodeDecodeError):
-        pass
+        return parse_message_date(lines)
+    except poplib.error_proto:
+        return None
+
+
+def get_message_dates(pop, msg_nums, cache=None):
+    """
+    Get the dates of several messages, with their TOPs pipelined into
+    one round-trip when the server allows it.
+
+    Returns:
+        {msg_num: date or None}
+
+    Raises:
+        OSError: If the connection drops, as for get_message_date
+    """
+    cache = {} if cache is None else cache
+    missing = [msg_num for msg_num in msg_nums if msg_num not in cache]
+    if missing:
+        headers = pop.top_many(missing)
+        for msg_num in missing:
+            cache[msg_num] = parse_message_date(headers.get(msg_num) or [])
+    return {msg_num: cache[msg_num] for msg_num in msg_nums}
+
+
+def get_uid(pop, msg_num):
+    """Return the server's unique ID for one message, or None."""
+    try:
+        return pop.uidl(msg_num).split()[2].decode('ascii', 'replace')
+    except (poplib.error_proto, OSError, IndexError):
+        return None
+
+
+def commit_applied(pop, msg_num, uid):
+    """
+    Check whether a QUIT that failed was applied anyway.
+
+    uid is the UIDL of msg_num, a message the commit should have deleted,
+    read before its DELE (servers refuse UIDL on a marked message). Numbers
+    only shift when a commit applies - new mail goes on the end - so if
+    msg_num still has that UIDL nothing was deleted. When that can't be
+    told, it counts as applied: a wrong guess then deletes less, never more.
+    """
+    return uid is None or get_uid(pop, msg_num) != uid
+
+
+def load_date_cache(pop, config, num_messages):
+    """
+    Load message dates saved by an earlier run, if numbering still matches.
+
+    POP3 only ever appends new mail, so if the highest saved message
+    number still has the same UIDL, every number below it does too. A
+    delete run moves that message down, so the cache is dropped unless
+    shift_date_cache renumbered it to match.
+
+    Returns:
+        {msg_num: date} dict, empty if nothing usable was saved
+    """
+    try:
+        with open(DATE_CACHE_FILE) as f:
+            saved = json.load(f)
+        if saved["email"] != config["email"] or saved["last"] > num_messages:
+            return {}
+        if get_uid(pop, saved["last"]) != saved["uid"]:
+            return {}
+        return {int(msg_num): datetime.fromisoformat(date) if date else None
+                for msg_num, date in saved["dates"].items()}
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+
+def save_date_cache(pop, config, date_cache):
+    """
+    Save probed message dates for the next run, owner-only.
+
+    Written to a temp file and renamed into place. Must be called before
+    QUIT, since the saved UIDL has to match this session's numbering.
+    """
+    if not date_cache:
+        return
+    last = max(date_cache)
+    uid = get_uid(pop, last)
+    if uid is None:
+        return
+    write_date_cache({
+        "email": config["email"],
+        "last": last,
+        "uid": uid,
+        "dates": {str(msg_num): date.isoformat() if date else None
+                  for msg_num, date in date_cache.items()},
+    })
+
+
+def write_date_cache(saved):
+    """Write the date cache file owner-only, via a temp file renamed into place."""
+    tmp_file = DATE_CACHE_FILE + ".tmp"
+    try:
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, stat.S_IRUSR | stat.S_IWUSR)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(saved, f)
+        os.replace(tmp_file, DATE_CACHE_FILE)
+    except OSError as e:
+        print(f"  Warning: could not save date cache: {e}")
+
+
+def shift_date_cache(config, start_pos, end_pos, deleted):
+    """
+    Carry the saved dates over a delete run, so the next run can reuse them.
+
+    Deletes only remove messages from start_pos..end_pos, so dates below
+    the range keep their numbers, dates after it move down by the number
+    deleted, and dates inside it are dropped. The saved UIDL moves with
+    its message, so load_date_cache still checks the result.
+    """
+    if not deleted:
+        return
+    try:
+        with open(DATE_CACHE_FILE) as f:
+            saved = json.load(f)
+        if saved["email"] != config["email"]:
+            return
+        if saved["last"] <= end_pos:
+            # The checked message was in the range - nothing left to check against
+            os.remove(DATE_CACHE_FILE)
+            return
+        saved["last"] -= deleted
+        saved["dates"] = {
+            str(msg_num if msg_num < start_pos else msg_num - deleted): date
+            for msg_num, date in ((int(n), d) for n, d in saved["dates"].items())
+            if not start_pos <= msg_num <= end_pos
+        }
+    except (OSError, ValueError, KeyError, TypeError):
+        return
+    write_date_cache(saved)
+
+
+def parse_message_date(lines):
+    """
+    Parse the Date header out of a message's lines, as a naive datetime.
+
+    Takes TOP's header lines or a whole RETR'd message - the scan stops at
+    the blank line ending the headers, so the body is never looked at.
+    Lines are matched as bytes, so only the Date line itself gets decoded.
+    A compiled regex over the joined lines measured slower than this
+    prefix check (the join alone costs more than the loop), so keep it.
+    """
+    for line in lines:
+        if not line:
+            break
+        if line[:5].lower() == b'date:':
+            dt = parse_date_value(line[5:])
+            if dt:
+                return dt
     return None
 
 
-def get_message_headers(pop, msg_num):
-    """Get Subject and From headers of a message using TOP command."""
+def parse_date_value(value):
+    """
+    Parse a Date header value, as a naive datetime in the sender's local time.
+
+    The usual 'Wed, 25 Dec 2024 03:14:15 +0000' shape is read directly;
+    anything else goes through parsedate_to_datetime.
+    """
+    match = DATE_VALUE_RE.search(value)
+    if match:
+        day, month, year, hour, minute, second = match.groups()
+        month = MONTHS.get(month.lower())
+        if month:
+            try:
+                return datetime(int(year), month, int(day), int(hour), int(minute), int(second))
+            except ValueError:
+                pass
     try:
-        response, lines, octets = pop.top(msg_num, 0)
-        subject = ""
-        sender = ""
-        for line in lines:
-            if isinstance(line, bytes):
-                line = line.decode('utf-8', errors='replace')
-            lower = line.lower()
-            if lower.startswith('subject:'):
-                subject = line[8:].strip()
-            elif lower.startswith('from:'):
-                sender = line[5:].strip()
-        return subject, sender
-    except (poplib.error_proto, OSError, UnicodeDecodeError):
-        return "", ""
+        dt = parsedate_to_datetime(value.decode('ascii', errors='replace').strip())
+        if dt.tzinfo:
+            dt = dt.replace(tzinfo=None)
+        return dt
+    except (ValueError, TypeError):
+        return None
+
+
+def get_message_headers_bulk(pop, msg_nums):
+    """
+    Get Subject and From headers of several messages, with their TOPs
+    pipelined when the server allows it.
+
+    Returns:
+        {msg_num: (subject, sender)} - empty strings if the server refused one
+
+    Raises:
+        ConnectionError: If the connection drops, see PipelinedPOP3._getline
+    """
+    return {msg_num: parse_message_headers(lines or [])
+            for msg_num, lines in pop.top_many(msg_nums).items()}
+
+
+def parse_message_headers(lines):
+    """Parse Subject and From out of TOP's header lines."""
+    subject = ""
+    sender = ""
+    # Match as bytes and only decode the two lines we keep
+    for line in lines:
+        if line[:8].lower() == b'subject:':
+            subject = line[8:].decode('utf-8', errors='replace').strip()
+        elif line[:5].lower() == b'from:':
+            sender = line[5:].decode('utf-8', errors='replace').strip()
+    return subject, sender
 
 
 def parse_exclusions(config):
@@ -192,9 +595,19 @@ def should_exclude(subject, sender, subject_keywords, sender_patterns):
     return False
 
 
-def binary_search_date(pop, num_messages, target_date, find_first_gte=True, label="cutoff"):
+def binary_search_date(pop, num_messages, target_date, find_first_gte=True, label="cutoff",
+                       date_cache=None, left_bound=1):
     """
-    Binary search to find message boundary by date.
+    Search for a message boundary by date.
+
+    Message numbers follow arrival order, so each probe is placed by
+    interpolating between the dates known to bracket the range (the oldest
+    and newest messages, when date_cache has them). On near-uniform
+    mailboxes this needs far fewer TOPs than bisection. After two guesses
+    in a row that fail to halve the range, a plain bisection step is taken,
+    so bursty mailboxes cost at most a few times a binary search. Once
+    the range is down to SEARCH_SWEEP_SIZE messages and the server allows
+    pipelining, the rest is fetched in a single round-trip.
 
     Args:
         pop: POP3 connection
@@ -203,30 +616,92 @@ def binary_search_date(pop, num_messages, target_date, find_first_gte=True, labe
         find_first_gte: If True, find first message >= target_date
                         If False, find last message < target_date
         label: Label for log output
+        date_cache: Optional {msg_num: date} dict, so neighbor probes and
+                    repeat searches don't re-issue TOP. Its dated entries
+                    also narrow the starting bracket
+        left_bound: First message that can be the answer, e.g. the start of
+                    a year range when searching for its end
 
     Returns:
         Message number of the boundary
     """
-    print(f"Binary searching for {label} in {num_messages:,} messages...")
+    print(f"Searching for {label} in {num_messages:,} messages...")
 
-    left = 1
+    left = left_bound
     right = num_messages
-    result = num_messages + 1 if find_first_gte else 0
+    result = num_messages + 1 if find_first_gte else left_bound - 1
+
+    # Known (position, date) points bracketing the range. The dateless
+    # messages stay cached as None, so neighbor probes skip them too
+    known = date_cache or {}
+    low_pos = max(1, left_bound - 1)
+    low_date = known.get(low_pos)
+    high_pos, high_date = num_messages, known.get(num_messages)
+
+    # Target outside the mailbox's date range - no probes needed
+    if high_date and high_date < target_date:
+        print(f"  Newest message is before {label}")
+        return num_messages + 1 if find_first_gte else num_messages
+    if low_date and low_date >= target_date:
+        print(f"  Oldest message is on or after {label}")
+        return left_bound if find_first_gte else left_bound - 1
+
+    # Every date already cached (earlier searches, or a previous run) is a
+    # probe we don't need to send - start from the tightest bracket they give
+    above = [pos for pos, date in known.items()
+             if date and left <= pos <= right and date >= target_date]
+    if above:
+        high_pos = min(above)
+        high_date = known[high_pos]
+        right = high_pos - 1
+        if find_first_gte:
+            result = high_pos
+    below = [pos for pos, date in known.items()
+             if date and left <= pos <= right and date < target_date]
+    if below:
+        low_pos = max(below)
+        low_date = known[low_pos]
+        left = low_pos + 1
+        if not find_first_gte:
+            result = low_pos
+    if above or below:
+        print(f"  Cached dates narrow the search to #{left:,}-#{right:,}")
+    poor_guesses = 0  # Consecutive probes that didn't halve the range
 
     iterations = 0
     while left <= right:
         iterations += 1
-        mid = (left + right) // 2
+        width = right - left
+
+        if width < SEARCH_SWEEP_SIZE and pop.supports_pipelining():
+            # Small bracket - fetch it all in one round-trip instead of
+            # probing the last few positions one by one
+            bracket = range(left, right + 1)
+            dates = get_message_dates(pop, bracket, date_cache)
+            print(f"  #{left:,}-#{right:,}: fetched {len(bracket)} dates in one round-trip")
+            if find_first_gte:
+                result = next((n for n in bracket if dates[n] and dates[n] >= target_date), result)
+            else:
+                result = next((n for n in reversed(bracket) if dates[n] and dates[n] < target_date), result)
+            break
 
-        msg_date = get_message_date(pop, mid)
+        if poor_guesses < 2 and low_date and high_date and low_date < target_date <= high_date:
+            fraction = (target_date - low_date) / (high_date - low_date)
+            mid = low_pos + int(fraction * (high_pos - low_pos))
+            mid = max(left, min(right, mid))
+        else:
+            mid = (left + right) // 2
+            poor_guesses = 0
+
+        msg_date = get_message_date(pop, mid, date_cache)
 
         if msg_date is None:
             print(f"  #{mid}: no date, trying neighbors...")
             found = False
             for offset in [1, -1, 2, -2, 5, -5]:
                 test_msg = mid + offset
-                if 1 <= test_msg <= num_messages:
-                    msg_date = get_message_date(pop, test_msg)
+                if left <= test_msg <= right:
+                    msg_date = get_message_date(pop, test_msg, date_cache)
                     if msg_date:
                         mid = test_msg
                         found = True
@@ -243,20 +718,26 @@ def binary_search_date(pop, num_messages, target_date, find_first_gte=True, labe
                 print(f"  #{mid:,}: {date_str} >= {label}, searching earlier...")
                 result = mid
                 right = mid - 1
+                high_pos, high_date = mid, msg_date
             else:
                 print(f"  #{mid:,}: {date_str} < {label}, searching later...")
                 left = mid + 1
+                low_pos, low_date = mid, msg_date
         else:
             # Finding last message < target_date
             if msg_date and msg_date < target_date:
                 print(f"  #{mid:,}: {date_str} < {label}, searching later...")
                 result = mid
                 left = mid + 1
+                low_pos, low_date = mid, msg_date
             else:
                 print(f"  #{mid:,}: {date_str} >= {label}, searching earlier...")
                 right = mid - 1
+                high_pos, high_date = mid, msg_date
+
+        poor_guesses = poor_guesses + 1 if right - left > width // 2 else 0
 
-    print(f"Binary search complete in {iterations} iterations")
+    print(f"Search complete in {iterations} iterations")
     return result
 
 
@@ -278,7 +759,7 @@ def parse_delete_years(delete_years_str):
     return start_year, end_year, start_date, end_date
 
 
-def get_deletion_range(pop, num_messages, config, oldest_date=None, newest_date=None):
+def get_deletion_range(pop, num_messages, config, oldest_date=None, newest_date=None, date_cache=None):
     """
     Determine what messages to delete based on config.
 
@@ -288,6 +769,7 @@ def get_deletion_range(pop, num_messages, config, oldest_date=None, newest_date=
         config: Configuration dict
         oldest_date: Date of oldest message (optimization - skip search if known)
         newest_date: Date of newest message (optimization - skip search if known)
+        date_cache: Optional {msg_num: date} dict shared by the searches
 
     Returns:
         (start_pos, end_pos, count, description)
@@ -298,6 +780,11 @@ def get_deletion_range(pop, num_messages, config, oldest_date=None, newest_date=
     """
     delete_years = config.get("DELETE_YEARS")
 
+    # A small mailbox's dates all fit in a couple of pipelined round-trips,
+    # after which the searches below run entirely from the cache
+    if date_cache is not None and num_messages <= SMALL_MAILBOX_SIZE and pop.supports_pipelining():
+        get_message_dates(pop, range(1, num_messages + 1), date_cache)
+
     if delete_years:
         # Year range mode
         start_year, end_year, start_date, end_date = parse_delete_years(delete_years)
@@ -311,7 +798,8 @@ def get_deletion_range(pop, num_messages, config, oldest_date=None, newest_date=
             start_pos = 1
         else:
             start_pos = binary_search_date(pop, num_messages, start_date,
-                                            find_first_gte=True, label=f"start of {start_year}")
+                                            find_first_gte=True, label=f"start of {start_year}",
+                                            date_cache=date_cache)
 
         # If requested end_year is at or after newest email, end at last message
         if newest_date and end_year >= newest_date.year:
@@ -319,8 +807,10 @@ def get_deletion_range(pop, num_messages, config, oldest_date=None, newest_date=
             end_pos = num_messages
         else:
             # Find first message AFTER end_year (first message of end_year+1)
+            # The year range ends at or after its start, so search from there
             end_pos = binary_search_date(pop, num_messages, end_date,
-                                          find_first_gte=True, label=f"end of {end_year}")
+                                          find_first_gte=True, label=f"end of {end_year}",
+                                          date_cache=date_cache, left_bound=start_pos)
             end_pos -= 1  # Last message of the target range
 
         if start_pos > end_pos or start_pos > num_messages:
@@ -333,14 +823,13 @@ def get_deletion_range(pop, num_messages, config, oldest_date=None, newest_date=
 
     else:
         # Cutoff date mode (existing behavior)
-        if config.get("CUTOFF_DATE"):
-            cutoff_date = datetime.strptime(config["CUTOFF_DATE"], "%d-%b-%Y")
-        else:
-            years = config.get("YEARS_OLD", 1)
-            cutoff_date = datetime.now() - timedelta(days=years * 365)
+        cutoff_date = get_cutoff_date(config)
 
         print(f"\nMode: Delete emails BEFORE {cutoff_date.strftime('%Y-%m-%d')}")
 
+        # oldest_date/newest_date come from main's endpoint TOPs, so these
+        # two cases (including --unhinged's usual "delete everything") cost
+        # no search probes at all
         # Optimize: if cutoff is before oldest email, nothing to delete
         if oldest_date and cutoff_date <= oldest_date:
             print(f"  Cutoff {cutoff_date.strftime('%Y-%m-%d')} is before oldest email {oldest_date.strftime('%Y-%m-%d')}")
@@ -353,7 +842,8 @@ def get_deletion_range(pop, num_messages, config, oldest_date=None, newest_date=
 
         # Find first message >= cutoff_date
         cutoff_msg = binary_search_date(pop, num_messages, cutoff_date,
-                                         find_first_gte=True, label="cutoff")
+                                         find_first_gte=True, label="cutoff",
+                                         date_cache=date_cache)
 
         if cutoff_msg <= 1:
             return None, None, 0, f"before {cutoff_date.strftime('%Y-%m-%d')}"
@@ -366,6 +856,13 @@ def get_deletion_range(pop, num_messages, config, oldest_date=None, newest_date=
         return start_pos, end_pos, count, description
 
 
+def close_zips(open_zips):
+    """Close every ZIP in an {zip_filename: ZipFile} dict and empty it."""
+    for zf in open_zips.values():
+        zf.close()
+    open_zips.clear()
+
+
 def backup_emails_to_zip(config, start_pos, end_pos, output_dir, delete_after=False):
     """
     Backup emails to monthly ZIP files containing EML files.
@@ -393,150 +890,206 @@ def backup_emails_to_zip(config, start_pos, end_pos, output_dir, delete_after=Fa
     zip_email_counts = defaultdict(int)  # {zip_filename: count}
 
     backed_up = 0
+    written = 0  # EMLs written, for unique names even when a rolled-back batch is written again
     deleted = 0
     consecutive_failures = 0
     max_failures = 5
-    batch_size = 50  # Download in batches to handle reconnection
+    batch_size = BACKUP_BATCH_SIZE  # Download in batches to handle reconnection
 
     # When deleting, we always read from start_pos since messages shift down
     # When not deleting, we advance current_msg
     remaining = total_to_process
 
-    while remaining > 0:
-        # Connect for this batch
-        try:
-            pop = connect_pop3(config)
-        except Exception as e:
-            print(f"Connection failed: {e}")
-            consecutive_failures += 1
-            if consecutive_failures >= max_failures:
-                print(f"Too many failures, stopping.")
-                break
-            time.sleep(30 * consecutive_failures)
-            continue
+    # Deleting needs a QUIT (and so a new connection) per batch to commit;
+    # a plain backup keeps one connection until something goes wrong
+    pop = None
 
-        # Check current mailbox state
-        try:
-            num_messages, _ = pop.stat()
-        except Exception as e:
-            print(f"STAT failed: {e}")
-            try:
-                pop.quit()
-            except Exception:
-                pass
-            consecutive_failures += 1
-            continue
+    # ZIPs stay open across batches, since every close rewrites the whole
+    # central directory - {zip_filename: ZipFile}
+    open_zips = {}
 
-        # Determine batch range
-        # When deleting, always start from start_pos (messages shift down)
-        # When not deleting, calculate position based on progress
-        if delete_after:
-            current_start = start_pos
-        else:
-            current_start = start_pos + backed_up
+    unconfirmed = None  # (position, uid, count) of a batch whose commit failed
 
-        if current_start > num_messages:
-            print("No more messages to process.")
-            try:
-                pop.quit()
-            except Exception:
-                pass
-            break
+    try:
+        while remaining > 0 or unconfirmed:
+            if pop is None:
+                try:
+                    pop = connect_pop3(config)
+                except Exception as e:
+                    print(f"Connection failed: {e}")
+                    consecutive_failures += 1
+                    if consecutive_failures >= max_failures:
+                        print(f"Too many failures, stopping.")
+                        break
+                    time.sleep(backoff(consecutive_failures, base=5, cap=300))
+                    continue
+
+                # Check current mailbox state (fixed for the rest of the session)
+                try:
+                    num_messages, _ = pop.stat()
+                except Exception as e:
+                    print(f"STAT failed: {e}")
+                    try:
+                        pop.quit()
+                    except Exception:
+                        pass
+                    pop = None
+                    consecutive_failures += 1
+                    continue
+
+                # A failed QUIT may still have been applied - only redo the
+                # batch if its first message is still where it was
+                if unconfirmed:
+                    position, uid, count = unconfirmed
+                    unconfirmed = None
+                    if commit_applied(pop, position, uid):
+                        print(f"  The failed commit was applied after all ({count} deleted)")
+                        deleted += count
+                    else:
+                        # Roll back our counters since delete failed
+                        backed_up -= count
+                        remaining += count
+
+            if remaining <= 0:
+                break
 
-        batch_count = min(batch_size, remaining, num_messages - current_start + 1)
-        batch_end = current_start + batch_count - 1
+            # Determine batch range
+            # When deleting, always start from start_pos (messages shift down)
+            # When not deleting, calculate position based on progress
+            if delete_after:
+                current_start = start_pos
+            else:
+                current_start = start_pos + backed_up
 
-        print(f"Downloading messages {current_start:,}-{batch_end:,} ({backed_up:,}/{total_to_process:,} done)...")
+            if current_start > num_messages:
+                print("No more messages to process.")
+                break
 
-        # Collect batch in memory, then write (keeps ZIP operations efficient)
-        batch_emails = []  # [(zip_filename, eml_filename, content), ...]
-        batch_msg_nums = []  # Track which messages to delete
+            batch_count = min(batch_size, remaining, num_messages - current_start + 1)
+            batch_end = current_start + batch_count - 1
 
-        for msg_num in range(current_start, batch_end + 1):
-            try:
-                # Get full message
-                _, lines, _ = pop.retr(msg_num)
-                content = b'\r\n'.join(lines)
-
-                # Get date for organizing
-                msg_date = get_message_date(pop, msg_num)
-                if msg_date:
-                    year, month = msg_date.year, msg_date.month
-                    date_str = msg_date.strftime('%Y%m%d')
-                else:
-                    year, month = 1970, 1  # Unknown dates
-                    date_str = "unknown"
-
-                # Use backed_up counter for unique filenames (not msg_num which resets)
-                file_index = backed_up + len(batch_emails) + 1
-                zip_filename = os.path.join(output_dir, f"emails_{year:04d}-{month:02d}.zip")
-                eml_filename = f"msg_{file_index:06d}_{date_str}.eml"
-                batch_emails.append((zip_filename, eml_filename, content))
-                batch_msg_nums.append(msg_num)
+            print(f"Downloading messages {current_start:,}-{batch_end:,} ({backed_up:,}/{total_to_process:,} done)...")
 
-            except Exception as e:
-                print(f"  Error on #{msg_num}: {e}")
+            batch_msg_nums = []  # Track which messages to delete
+
+            # Download the whole batch in one pipelined burst. One connection on
+            # purpose: POP3 servers lock the maildrop per session (RFC 1939), so
+            # a pool of parallel sessions can't safely share the mailbox.
+            # Each message is written into its ZIP as its reply is read and
+            # then dropped, so only one is held in memory at a time
+            try:
+                for msg_num, lines in pop.retr_each(range(current_start, batch_end + 1)):
+                    try:
+                        if lines is None:
+                            raise poplib.error_proto("message could not be downloaded")
+
+                        # Get date for organizing, from the headers RETR already sent
+                        msg_date = parse_message_date(lines)
+                        if msg_date:
+                            year, month = msg_date.year, msg_date.month
+                            date_str = msg_date.strftime('%Y%m%d')
+                        else:
+                            year, month = 1970, 1  # Unknown dates
+                            date_str = "unknown"
+
+                        # Use a running counter for unique filenames (not msg_num which resets)
+                        written += 1
+                        file_index = written
+                        zip_filename = os.path.join(output_dir, f"emails_{year:04d}-{month:02d}.zip")
+                        eml_filename = f"msg_{file_index:06d}_{date_str}.eml"
+
+                        zf = open_zips.get(zip_filename)
+                        if zf is None:
+                            mode = 'a' if os.path.exists(zip_filename) else 'w'
+                            zf = zipfile.ZipFile(zip_filename, mode, zipfile.ZIP_DEFLATED, compresslevel=1)
+                            open_zips[zip_filename] = zf
+                        with zf.open(eml_filename, 'w') as fp:
+                            fp.write(b'\r\n'.join(lines))
+                        zip_email_counts[zip_filename] += 1
+                        batch_msg_nums.append(msg_num)
+
+                    except Exception as e:
+                        print(f"  Error on #{msg_num}: {e}")
+                        consecutive_failures += 1
+                        if consecutive_failures >= max_failures:
+                            break
+            except (OSError, poplib.error_proto) as e:
+                # Nothing is marked for deletion in this session yet, so the
+                # connection can be dropped without a QUIT on a dead socket.
+                # A plain backup keeps what it wrote; a deleting one can't
+                # DELE it now, so it's downloaded (and written) again
+                print(f"  Download failed: {e} - reconnecting")
+                pop.close()
+                pop = None
+                if not delete_after:
+                    backed_up += len(batch_msg_nums)
+                    remaining -= len(batch_msg_nums)
                 consecutive_failures += 1
                 if consecutive_failures >= max_failures:
+                    print(f"Too many failures, stopping.")
                     break
+                time.sleep(backoff(consecutive_failures, base=5, cap=300))
+                continue
 
-        if consecutive_failures >= max_failures:
-            try:
-                pop.quit()
-            except Exception:
-                pass
-            break
+            backed_up += len(batch_msg_nums)
+            remaining -= len(batch_msg_nums)
+
+            if consecutive_failures >= max_failures:
+                # Replies to the rest of the batch are still unread, and
+                # nothing is marked yet - drop the session rather than QUIT
+                pop.close()
+                pop = None
+                break
 
-        # Write batch to ZIP files
-        batch_by_zip = defaultdict(list)
-        for zip_filename, eml_filename, content in batch_emails:
-            batch_by_zip[zip_filename].append((eml_filename, content))
-
-        for zip_filename, emails in batch_by_zip.items():
-            mode = 'a' if os.path.exists(zip_filename) else 'w'
-            with zipfile.ZipFile(zip_filename, mode, zipfile.ZIP_DEFLATED) as zf:
-                for eml_filename, content in emails:
-                    zf.writestr(eml_filename, content)
-            zip_email_counts[zip_filename] += len(emails)
-
-        backed_up += len(batch_emails)
-        remaining -= len(batch_emails)
-
-        # Delete batch if requested
-        if delete_after and batch_msg_nums:
-            print(f"  Marking {len(batch_msg_nums)} messages for deletion...")
-            for msg_num in batch_msg_nums:
+            # Delete batch if requested
+            if delete_after and batch_msg_nums:
+                # The backup has to be complete on disk before the server
+                # forgets these messages
+                close_zips(open_zips)
+                print(f"  Marking {len(batch_msg_nums)} messages for deletion...")
+                uid = get_uid(pop, batch_msg_nums[0])  # Before its DELE, for commit_applied
                 try:
-                    pop.dele(msg_num)
+                    failed = pop.dele_many(batch_msg_nums)
+                    for msg_num, e in failed.items():
+                        print(f"  Delete error on #{msg_num}: {e}")
+                    if batch_msg_nums[0] in failed:
+                        uid = None
                 except Exception as e:
-                    print(f"  Delete error on #{msg_num}: {e}")
+                    print(f"  Delete error: {e}")
 
-            # Commit deletions
-            try:
-                pop.quit()
-                deleted += len(batch_msg_nums)
+                # Commit deletions
+                committing, pop = pop, None
+                try:
+                    committing.quit()
+                    deleted += len(batch_msg_nums)
+                    consecutive_failures = 0
+                    print(f"  Deleted {len(batch_msg_nums)} messages.")
+                    # Every batch costs a login, so take bigger ones while
+                    # the server keeps accepting them
+                    batch_size = min(MAX_BACKUP_BATCH_SIZE, batch_size * 2)
+                except Exception as e:
+                    print(f"  Commit FAILED: {e} - will check it and retry the batch")
+                    consecutive_failures += 1
+                    batch_size = max(BACKUP_BATCH_SIZE, batch_size // 2)
+                    unconfirmed = (batch_msg_nums[0], uid, len(batch_msg_nums))
+                    time.sleep(backoff(consecutive_failures, base=15, cap=600))
+                    continue
+            else:
                 consecutive_failures = 0
-                print(f"  Deleted {len(batch_msg_nums)} messages.")
-            except Exception as e:
-                print(f"  Commit FAILED: {e} - will retry batch")
-                consecutive_failures += 1
-                # Roll back our counters since delete failed
-                backed_up -= len(batch_emails)
-                remaining += len(batch_emails)
-                time.sleep(30 * consecutive_failures)
-                continue
-        else:
-            try:
-                pop.quit()
-            except Exception:
-                pass
-            consecutive_failures = 0
 
-        print(f"  Progress: {backed_up:,}/{total_to_process:,} ({100*backed_up/total_to_process:.1f}%)")
+            print(f"  Progress: {backed_up:,}/{total_to_process:,} ({100*backed_up/total_to_process:.1f}%)")
+
+            # Brief pause between batches
+            if remaining > 0:
+                time.sleep(2)
+    finally:
+        close_zips(open_zips)
 
-        # Brief pause between batches
-        if remaining > 0:
-            time.sleep(2)
+    if pop is not None:
+        try:
+            pop.quit()
+        except Exception:
+            pass
 
     # Print summary
     print(f"\nBackup complete:")
@@ -558,22 +1111,44 @@ def delete_messages_robust(config, messages_to_delete, start_position=1):
     """
     Delete messages with robust reconnection handling.
 
+    POP3 only applies DELEs at QUIT, so each session marks several batches
+    before committing them all with one QUIT, instead of paying a fresh
+    TLS handshake + login for every batch. While the last 8 commits all
+    succeeded quickly, sessions double in size until a commit has failed
+    once and grow by one batch after that; a failed commit halves them.
+    Reconnects only happen to commit or after an error.
+
+    Progress is counted from successful commits rather than the mailbox
+    size, since new mail arriving mid-run would hide deletions. When a
+    QUIT fails, the next session checks the UIDL of one of the marked
+    messages to see whether the commit applied anyway (commit_applied).
+
     Args:
         config: Configuration dict
         messages_to_delete: Total number of messages to delete
         start_position: Message number to start deleting from (default 1)
                         For year ranges, this may be > 1
+
+    Returns:
+        Number of messages deleted by successful commits
     """
     batch_size = min(config.get("BATCH_SIZE", 50), 50)  # Cap at 50 - Yahoo kills connections on larger batches
+    session_batches = BATCHES_PER_SESSION
+    recent_commits = deque(maxlen=8)  # (seconds, ok) of the latest QUITs
+    commit_failed = False  # Once Yahoo has rejected a commit, only grow slowly
     consecutive_failures = 0
     max_failures = 5
 
-    # Track progress by checking actual mailbox count
-    initial_count = None
+    # Parse exclusions if configured
+    subject_keywords, sender_patterns = parse_exclusions(config)
+    has_exclusions = subject_keywords or sender_patterns
+
+    kept = 0  # Excluded messages - they stay at the front of the range after each commit
+    committed = 0  # Deletes applied by successful QUITs
+    unconfirmed = None  # (position, uid, marked, skipped) of a failed commit
 
     while True:
-        # Connect fresh for each batch
-        print(f"\nConnecting for batch...")
+        print(f"\nConnecting...")
         try:
             pop = connect_pop3(config)
         except Exception as e:
@@ -582,8 +1157,8 @@ def delete_messages_robust(config, messages_to_delete, start_position=1):
             if consecutive_failures >= max_failures:
                 print(f"Too many consecutive failures ({max_failures}), stopping.")
                 break
-            wait_time = min(30 * consecutive_failures, 120)
-            print(f"Waiting {wait_time} seconds before retry...")
+            wait_time = backoff(consecutive_failures, base=5, cap=300)
+            print(f"Waiting {wait_time:.0f} seconds before retry...")
             time.sleep(wait_time)
             continue
 
@@ -600,125 +1175,153 @@ def delete_messages_robust(config, messages_to_delete, start_position=1):
             if consecutive_failures >= max_failures:
                 print(f"Too many consecutive failures ({max_failures}), stopping.")
                 break
-            wait_time = min(30 * consecutive_failures, 120)
-            print(f"Waiting {wait_time} seconds before retry...")
+            wait_time = backoff(consecutive_failures, base=5, cap=300)
+            print(f"Waiting {wait_time:.0f} seconds before retry...")
             time.sleep(wait_time)
             continue
 
-        # Track initial count for progress
-        if initial_count is None:
-            initial_count = num_messages
+        # A failed QUIT may still have been applied - if so, a message it
+        # marked is gone from its number
+        if unconfirmed:
+            position, uid, marked, skipped = unconfirmed
+            unconfirmed = None
+            if commit_applied(pop, position, uid):
+                print(f"The failed commit was applied after all ({marked:,} deleted)")
+                committed += marked
+                kept += skipped
 
-        # Calculate actual deletions based on mailbox shrinking
-        actual_deleted = initial_count - num_messages
-        print(f"Mailbox has {num_messages:,} messages (deleted {actual_deleted:,} so far)")
+        print(f"Mailbox has {num_messages:,} messages (deleted {committed:,} so far)")
 
         if num_messages == 0:
             print("Mailbox empty!")
             pop.quit()
             break
 
-        # Check if we've deleted enough
-        if actual_deleted >= messages_to_delete:
+        # Check if we've deleted (or kept) everything in the range
+        remaining = messages_to_delete - committed - kept
+        if remaining <= 0:
             print("Target reached!")
             pop.quit()
             break
 
-        # For year range deletion, check if start_position is still valid
-        # (After deletions, the range shifts down)
-        current_start = start_position
-        if start_position > 1:
-            # Adjust start position based on how much the mailbox has shrunk
-            # Since we always delete from start_position, after deletions
-            # the start_position stays the same (earlier messages are preserved)
-            current_start = start_position
-
+        # Messages before start_position are preserved, and so are the
+        # excluded ones already checked, so the range left starts after both
+        current_start = start_position + kept
         if current_start > num_messages:
             print("Start position beyond mailbox, done!")
             pop.quit()
             break
 
-        # Calculate how many to delete this batch
-        remaining = messages_to_delete - actual_deleted
-        batch_count = min(batch_size, remaining, num_messages - current_start + 1)
+        # Message numbers don't shift until QUIT, so batches within this
+        # session walk forward through the range
+        session_end = min(current_start + remaining, num_messages + 1)
+        marked_count = 0
+        skipped_count = 0
+        errors_this_session = 0
+        first_marked = None  # (position, uid) of a message marked this session
 
-        if batch_count <= 0:
-            pop.quit()
-            break
+        batch_start = current_start
+        for _ in range(session_batches):
+            if batch_start >= session_end or errors_this_session > 10:
+                break
+            batch_end = min(batch_start + batch_size, session_end)
+            progress(f"  Checking #{batch_start:,}-#{batch_end - 1:,} ({marked_count:,} marked this session)...")
 
-        end_msg = current_start + batch_count - 1
-        print(f"Checking messages {current_start}-{end_msg} for deletion...")
+            # Check exclusions before deleting - the whole batch's headers
+            # are fetched in one pipelined burst
+            headers = {}
+            if has_exclusions:
+                try:
+                    headers = get_message_headers_bulk(pop, range(batch_start, batch_end))
+                except (poplib.error_proto, OSError) as e:
+                    log(f"  Error fetching headers: {e}")
+                    break  # Connection is likely gone - commit what was marked
 
-        # Parse exclusions if configured
-        subject_keywords, sender_patterns = parse_exclusions(config)
-        has_exclusions = subject_keywords or sender_patterns
+            to_delete = []
+            for i in range(batch_start, batch_end):
+                try:
+                    if has_exclusions:
+                        subject, sender = headers[i]
+                        if should_exclude(subject, sender, subject_keywords, sender_patterns):
+                            skipped_count += 1
+                            if skipped_count <= 10:
+                                log(f"  KEPT #{i}: \"{subject[:50]}\" from {sender[:40]}")
+                            elif skipped_count == 11:
+                                log(f"  (suppressing further exclusion messages...)")
+                            continue
+
+                    to_delete.append(i)
 
-        marked_count = 0
-        skipped_count = 0
-        errors_this_batch = 0
+                except Exception as e:
+                    errors_this_session += 1
+                    if errors_this_session <= 3:
+                        log(f"  Error on #{i}: {e}")
+                    if errors_this_session > 10:
+                        log(f"  Too many errors, trying to commit what we have...")
+                        break
 
-        for i in range(current_start, current_start + batch_count):
+            # Mark the batch in one pipelined burst, noting one marked
+            # message's UIDL first in case the commit has to be checked
             try:
-                # Check exclusions before deleting
-                if has_exclusions:
-                    subject, sender = get_message_headers(pop, i)
-                    if should_exclude(subject, sender, subject_keywords, sender_patterns):
-                        skipped_count += 1
-                        if skipped_count <= 10:
-                            print(f"  KEPT #{i}: \"{subject[:50]}\" from {sender[:40]}")
-                        elif skipped_count == 11:
-                            print(f"  (suppressing further exclusion messages...)")
-                        continue
-
-                pop.dele(i)
-                marked_count += 1
-
-                if marked_count % 50 == 0:
-                    print(f"  Marked {marked_count:,}/{batch_count:,}...")
-
+                uid = get_uid(pop, to_delete[0]) if to_delete and first_marked is None else None
+                failed = pop.dele_many(to_delete)
+                if uid is not None and to_delete[0] not in failed:
+                    first_marked = (to_delete[0], uid)
+                marked_count += len(to_delete) - len(failed)
+                for msg_num, e in list(failed.items())[:3]:
+                    log(f"  Error on #{msg_num}: {e}")
             except Exception as e:
-                errors_this_batch += 1
-                if errors_this_batch <= 3:
-                    print(f"  Error on #{i}: {e}")
-                if errors_this_batch > 10:
-                    print(f"  Too many errors, trying to commit what we have...")
-                    break
+                log(f"  Error marking messages: {e}")
+                break  # Connection is likely gone - the commit attempt will tell
+            batch_start = batch_end
 
         if skipped_count > 0:
-            print(f"  Excluded {skipped_count} messages matching filters")
+            log(f"  Excluded {skipped_count} messages matching filters")
 
         # Commit by quitting - this is where Yahoo may reject
-        print(f"Committing {marked_count:,} deletions...")
+        log(f"Committing {marked_count:,} deletions...")
+        commit_start = time.time()
         try:
             pop.quit()
             consecutive_failures = 0  # Reset on success
+            kept += skipped_count
+            committed += marked_count
+            recent_commits.append((time.time() - commit_start, True))
             print("Commit successful.")
         except Exception as e:
+            recent_commits.append((time.time() - commit_start, False))
+            commit_failed = True
             print(f"Commit FAILED: {e}")
-            print("Deletions were NOT applied. Will retry...")
+            print("Deletions may not have been applied. Will check and retry...")
+            if marked_count:
+                position, uid = first_marked or (current_start, None)
+                unconfirmed = (position, uid, marked_count, skipped_count)
             consecutive_failures += 1
             if consecutive_failures >= max_failures:
                 print(f"Too many consecutive failures ({max_failures}), stopping.")
                 break
+            # Smaller commits from now on, in case the session was too long
+            session_batches = max(1, session_batches // 2)
             # Longer pause after commit failure
-            wait_time = min(60 * consecutive_failures, 300)
-            print(f"Waiting {wait_time} seconds before retry...")
+            wait_time = backoff(consecutive_failures, base=15, cap=600)
+            print(f"Waiting {wait_time:.0f} seconds before retry...")
             time.sleep(wait_time)
             continue
 
-        # Brief pause between successful batches
+        # Server is keeping up - try a slightly bigger session next time
+        if (len(recent_commits) == recent_commits.maxlen
+                and all(ok for _, ok in recent_commits)
+                and sum(secs for secs, _ in recent_commits) / len(recent_commits) < SLOW_COMMIT_SECONDS
+                and session_batches < MAX_BATCHES_PER_SESSION):
+            session_batches = min(MAX_BATCHES_PER_SESSION,
+                                  session_batches + 1 if commit_failed else session_batches * 2)
+            print(f"  Commits look healthy, marking {session_batches} batches per session")
+
+        # Brief pause between successful commits
         print("Pausing 3 seconds...")
         time.sleep(3)
 
-    # Final count
-    try:
-        pop = connect_pop3(config)
-        final_count, _ = pop.stat()
-        pop.quit()
-        total_deleted = initial_count - final_count if initial_count else 0
-        return total_deleted
-    except Exception:
-        return initial_count - num_messages if initial_count else 0
+    return committed
 
 
 def main():
@@ -804,17 +1407,43 @@ Examples:
 
     # Show first and last message dates
     print("\nChecking message date range...")
-    first_date = get_message_date(pop, 1)
-    last_date = get_message_date(pop, num_messages)
-    print(f"  Oldest (#{1}): {first_date.strftime('%Y-%m-%d') if first_date else 'unknown'}")
-    print(f"  Newest (#{num_messages:,}): {last_date.strftime('%Y-%m-%d') if last_date else 'unknown'}")
-
-    # Determine what to delete based on config (pass dates to optimize searches)
-    start_pos, end_pos, messages_to_delete, description = get_deletion_range(
-        pop, num_messages, config, oldest_date=first_date, newest_date=last_date
-    )
-
-    pop.quit()  # Close connection before deletion phase
+    date_cache = load_date_cache(pop, config, num_messages)  # {msg_num: date}
+    if date_cache:
+        print(f"  Reusing {len(date_cache)} dates saved by the last run")
+    # Nothing is committed while searching, so message numbers (and every
+    # date found so far) stay valid on a new connection
+    max_attempts = 3
+    for attempt in range(1, max_attempts + 1):
+        try:
+            if pop is None:
+                pop = connect_pop3(config)
+            get_message_dates(pop, [1, num_messages], date_cache)  # Both TOPs in one round-trip
+            first_date, last_date = date_cache[1], date_cache[num_messages]
+            print(f"  Oldest (#{1}): {first_date.strftime('%Y-%m-%d') if first_date else 'unknown'}")
+            print(f"  Newest (#{num_messages:,}): {last_date.strftime('%Y-%m-%d') if last_date else 'unknown'}")
+
+            # Determine what to delete based on config (pass dates to optimize searches)
+            start_pos, end_pos, messages_to_delete, description = get_deletion_range(
+                pop, num_messages, config, oldest_date=first_date, newest_date=last_date,
+                date_cache=date_cache
+            )
+            break
+        except (OSError, poplib.error_proto) as e:  # OSError includes ConnectionError from a hang-up
+            print(f"\nConnection lost while searching: {e}")
+            if pop is not None:
+                pop.close()
+                pop = None
+            if attempt == max_attempts:
+                print("Nothing was deleted. Run again to retry.")
+                sys.exit(1)
+            print("  Reconnecting - dates found so far are kept")
+            time.sleep(backoff(attempt, base=5, cap=60))
+
+    save_date_cache(pop, config, date_cache)
+    try:
+        pop.quit()  # Close connection before deletion phase - nothing to commit yet
+    except (OSError, poplib.error_proto):
+        pop.close()
 
     print()
     print("=" * 60)
@@ -877,6 +1506,7 @@ Examples:
             config, start_pos, end_pos, args.backup,
             delete_after=args.delete
         )
+        shift_date_cache(config, start_pos, end_pos, deleted)
 
         if backed_up < messages_to_delete:
             print(f"\nWARNING: Only backed up {backed_up:,} of {messages_to_delete:,} emails!")
@@ -912,6 +1542,7 @@ Examples:
     print("=" * 60)
 
     total_deleted = delete_messages_robust(config, messages_to_delete, start_pos)
+    shift_date_cache(config, start_pos, end_pos, total_deleted)
 
     print("\n" + "=" * 60)
     print("COMPLETE!")